@@ -18,6 +18,11 @@ DOCUMENT_ID = "169fOjfUuf2j-V0HIVCS8REf3Wtl94D5Gxt67sUdgJQs"
 SERVICE_ACCOUNT_KEY = "service-account-key.json"
 SCOPES = ['https://www.googleapis.com/auth/documents']
 
+# Contact patterns (run once over the full document text)
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_RE = re.compile(r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b')
+URL_RE = re.compile(r'https?://[^\s]+')
+
 class BMPOADocumentTool:
     def __init__(self):
         self.service = None
@@ -69,6 +74,8 @@ class BMPOADocumentTool:
             }
         }
         
+        texts = []
+        
         # Process content
         for element in content:
             if 'paragraph' in element:
@@ -76,12 +83,16 @@ class BMPOADocumentTool:
                 paragraph = element['paragraph']
                 text = ''
                 
+                # Bulleted paragraphs are list items
+                if paragraph.get('bullet'):
+                    analysis['lists'] += 1
+                
                 # Extract text
                 for elem in paragraph.get('elements', []):
                     if 'textRun' in elem:
                         text += elem['textRun'].get('content', '')
                 
-                analysis['total_text'] += text
+                texts.append(text)
                 
                 # Check if header (all caps, short)
                 if text.strip() and text.strip().isupper() and len(text.strip()) < 100:
@@ -90,20 +101,15 @@ class BMPOADocumentTool:
                         'index': element.get('startIndex', 0)
                     })
                 
-                # Extract contact info
-                emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
-                phones = re.findall(r'\b\d{3}[-.\s]?\d{3}[-.\s]?\d{4}\b', text)
-                urls = re.findall(r'https?://[^\s]+', text)
-                
-                analysis['contacts']['emails'].extend(emails)
-                analysis['contacts']['phones'].extend(phones)
-                analysis['contacts']['urls'].extend(urls)
-                
             elif 'table' in element:
                 analysis['tables'] += 1
-            
-            elif 'paragraph' in element and element['paragraph'].get('bullet'):
-                analysis['lists'] += 1
+        
+        analysis['total_text'] = ''.join(texts)
+        
+        # Extract contact info in a single pass per pattern
+        analysis['contacts']['emails'] = EMAIL_RE.findall(analysis['total_text'])
+        analysis['contacts']['phones'] = PHONE_RE.findall(analysis['total_text'])
+        analysis['contacts']['urls'] = URL_RE.findall(analysis['total_text'])
         
         # Calculate statistics
         words = analysis['total_text'].split()
@@ -178,6 +184,40 @@ class BMPOADocumentTool:
             print(f"❌ Error replacing text: {e}")
             return 0
     
+    def replace_many(self, pairs: List[Tuple[str, str]], match_case: bool = False) -> List[int]:
+        """Replace several texts in a single batch update"""
+        if not pairs:
+            return []
+        
+        requests = [{
+            'replaceAllText': {
+                'containsText': {
+                    'text': search_text,
+                    'matchCase': match_case
+                },
+                'replaceText': replace_text
+            }
+        } for search_text, replace_text in pairs]
+        
+        try:
+            result = self.service.documents().batchUpdate(
+                documentId=DOCUMENT_ID,
+                body={'requests': requests}
+            ).execute()
+            
+            replies = result.get('replies', [])
+            counts = [
+                reply.get('replaceAllText', {}).get('occurrencesChanged', 0)
+                for reply in replies
+            ]
+            counts += [0] * (len(pairs) - len(counts))
+            print(f"✅ Replaced {sum(counts)} occurrences across {len(pairs)} substitutions")
+            return counts
+        
+        except HttpError as e:
+            print(f"❌ Error replacing text: {e}")
+            return [0] * len(pairs)
+    
     def highlight_text(self, search_text: str, color: str = 'yellow'):
         """Highlight all occurrences of text"""
         occurrences = self.search_text(search_text)
@@ -305,9 +345,9 @@ class BMPOADocumentTool:
             print(f"❌ Error formatting headers: {e}")
             return False
     
-    def export_analysis(self, filename: str = 'bmpoa_analysis.json'):
+    def export_analysis(self, filename: str = 'bmpoa_analysis.json', analysis: Optional[Dict] = None):
         """Export document analysis to file"""
-        analysis = self.analyze_document()
+        analysis = analysis or self.analyze_document()
         
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(analysis, f, indent=2)
@@ -315,9 +355,9 @@ class BMPOADocumentTool:
         print(f"✅ Analysis exported to {filename}")
         return filename
     
-    def generate_report(self):
+    def generate_report(self, analysis: Optional[Dict] = None):
         """Generate a comprehensive report"""
-        analysis = self.analyze_document()
+        analysis = analysis or self.analyze_document()
         
         report = []
         report.append(f"BMPOA Document Analysis Report")
@@ -371,17 +411,21 @@ def main():
     if not tool.get_document():
         return
     
+    # Analyze once and share the result
+    analysis = tool.analyze_document()
+    
     # Generate report
     print("\n📊 Generating analysis report...")
-    tool.generate_report()
+    tool.generate_report(analysis)
     
     # Export full analysis
-    tool.export_analysis()
+    tool.export_analysis(analysis=analysis)
     
     print("\n" + "=" * 60)
     print("Available Operations:")
     print("1. Search for text: tool.search_text('BMPOA')")
     print("2. Replace text: tool.replace_text('old', 'new')")
+    print("   Bulk replace: tool.replace_many([('old', 'new'), ('foo', 'bar')])")
     print("3. Highlight text: tool.highlight_text('important', 'yellow')")
     print("4. Add table of contents: tool.add_table_of_contents()")
     print("5. Format headers: tool.format_headers()")
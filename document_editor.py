@@ -7,30 +7,41 @@ import os
 import re
 from typing import List, Dict, Tuple
 
+# Patterns are compiled once and reused for every scan of the document
+SECTION_HEADER_RE = re.compile(r'^[IVX]+\.\s+[A-Z\s&]+$')
+PHONE_RE = re.compile(r'(\d{3}-\d{3}-\d{4})')
+EMAIL_RE = re.compile(r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})')
+
 class BMPOADocumentEditor:
     def __init__(self):
         self.txt_file = "bmpoa_document.txt"
         self.html_file = "bmpoa_document.html"
         self.docx_file = "bmpoa_document.docx"
         self.content = None
+        self.lines = []
+        self.lines_lower = []
         self.sections = {}
+        self.word_count = 0
+        self.section_word_counts = {}
         
     def load_document(self):
         """Load the document content"""
         with open(self.txt_file, 'r', encoding='utf-8') as f:
             self.content = f.read()
+        self.lines = self.content.split('\n')
+        self.lines_lower = [line.lower() for line in self.lines]
+        self.word_count = len(self.content.split())
         self._parse_sections()
         print(f"✓ Document loaded: {len(self.content)} characters")
         
     def _parse_sections(self):
         """Parse document into sections"""
-        lines = self.content.split('\n')
         current_section = None
         section_content = []
         
-        for line in lines:
+        for line in self.lines:
             # Check for main section headers (Roman numerals)
-            if re.match(r'^[IVX]+\.\s+[A-Z\s&]+$', line.strip()):
+            if SECTION_HEADER_RE.match(line.strip()):
                 if current_section:
                     self.sections[current_section] = '\n'.join(section_content)
                 current_section = line.strip()
@@ -41,6 +52,11 @@ class BMPOADocumentEditor:
         # Save last section
         if current_section:
             self.sections[current_section] = '\n'.join(section_content)
+        
+        # Word counts are fixed once the document is loaded
+        self.section_word_counts = {
+            name: len(text.split()) for name, text in self.sections.items()
+        }
             
     def view_structure(self):
         """Display document structure"""
@@ -48,27 +64,24 @@ class BMPOADocumentEditor:
         print("=" * 50)
         
         # Count words and characters
-        words = len(self.content.split())
+        words = self.word_count
         chars = len(self.content)
         
         print(f"Total Words: {words:,}")
         print(f"Total Characters: {chars:,}")
         print(f"\nMain Sections ({len(self.sections)}):")
         
-        for i, section in enumerate(self.sections.keys(), 1):
-            section_content = self.sections[section]
-            section_words = len(section_content.split())
+        for i, (section, section_words) in enumerate(self.section_word_counts.items(), 1):
             print(f"{i}. {section} ({section_words} words)")
             
     def search(self, query: str) -> List[Tuple[int, str]]:
         """Search for text in document"""
         results = []
-        lines = self.content.split('\n')
         query_lower = query.lower()
         
-        for i, line in enumerate(lines):
-            if query_lower in line.lower():
-                results.append((i+1, line.strip()))
+        for i, line_lower in enumerate(self.lines_lower):
+            if query_lower in line_lower:
+                results.append((i+1, self.lines[i].strip()))
                 
         return results
     
@@ -87,7 +100,7 @@ class BMPOADocumentEditor:
             lines = content.split('\n')
             for line in lines:
                 # Look for phone numbers
-                phone_match = re.search(r'(\d{3}-\d{3}-\d{4})', line)
+                phone_match = PHONE_RE.search(line)
                 if phone_match:
                     # Extract name before phone
                     parts = line.split(phone_match.group(1))
@@ -96,7 +109,7 @@ class BMPOADocumentEditor:
                         contacts[name] = phone_match.group(1)
                         
                 # Look for email addresses
-                email_match = re.search(r'([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})', line)
+                email_match = EMAIL_RE.search(line)
                 if email_match:
                     parts = line.split(email_match.group(1))
                     if parts[0].strip():
@@ -125,7 +138,7 @@ class BMPOADocumentEditor:
                 summary.append(f"\n{section}:")
                 # Get next few lines after the header
                 start_line = results[0][0]
-                lines = self.content.split('\n')
+                lines = self.lines
                 for i in range(start_line, min(start_line + 5, len(lines))):
                     if lines[i-1].strip():
                         summary.append(f"  {lines[i-1].strip()}")
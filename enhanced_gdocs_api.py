@@ -4,9 +4,18 @@ Enhanced Google Docs API Implementation
 Based on 2024 API Documentation and Best Practices
 """
 
+import io
 import os
+import re
 import json
-from typing import List, Dict, Any, Optional, Tuple
+import shelve
+import sys
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import accumulate
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import google.auth
@@ -22,13 +31,53 @@ SCOPES = {
     'full': ['https://www.googleapis.com/auth/documents']
 }
 
+# Documents persisted between runs, keyed by document ID and checked by
+# revisionId. Opt-in (pass disk_cache_path=DISK_CACHE_PATH): the shelf holds
+# plaintext document contents. It is cleared once its files pass
+# DISK_CACHE_MAX_BYTES, since some dbm backends never reclaim overwritten
+# records.
+DISK_CACHE_PATH = os.path.expanduser('~/.bmpoa_docs_cache')
+DISK_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+# Authorized services reused within a process, keyed by (credential source, scope)
+_SERVICE_CACHE: Dict[Tuple[str, str], Tuple[Any, Any]] = {}
+
+# In-memory document cache bounds
+DOCUMENT_CACHE_TTL = 60.0
+DOCUMENT_CACHE_SIZE = 64
+
+# Calls allowed in one HTTP batch request
+MAX_BATCH_HTTP_CALLS = 100
+
+# Requests sent per documents.batchUpdate call
+MAX_BATCH_UPDATE_REQUESTS = 200
+
+# Highest character stored as a single UTF-16 code unit
+MAX_BMP_CHAR = '\uffff'
+
+def utf16_length(text: str) -> int:
+    """Length of text in UTF-16 code units, as Docs API indices count it"""
+    return len(text.encode('utf-16-le')) // 2
+
+def utf16_prefix_lengths(text: str) -> Sequence[int]:
+    """
+    UTF-16 code units preceding each character position of text
+    
+    Entry i is the UTF-16 offset of text[i]; the last entry is the
+    UTF-16 length of the whole string.
+    """
+    # Text without astral characters (the usual case) maps 1:1
+    if not text or max(text) <= MAX_BMP_CHAR:
+        return range(len(text) + 1)
+    return [0, *accumulate(2 if ch > MAX_BMP_CHAR else 1 for ch in text)]
+
 @dataclass
 class TextRange:
     """Represents a text range in the document"""
     start_index: int
     end_index: int
     
-@dataclass
+@dataclass(frozen=True)
 class TextStyle:
     """Text formatting options"""
     bold: Optional[bool] = None
@@ -39,6 +88,98 @@ class TextStyle:
     foreground_color: Optional[Dict[str, float]] = None
     background_color: Optional[Dict[str, float]] = None
 
+def _color_key(color: Optional[Dict[str, float]]) -> Optional[Tuple[Tuple[str, float], ...]]:
+    """Hashable form of an rgbColor dict"""
+    return tuple(sorted(color.items())) if color is not None else None
+
+@lru_cache(maxsize=128)
+def _build_text_style(bold, italic, underline, font_size, font_family,
+                      foreground_color, background_color) -> Tuple[Dict[str, Any], str]:
+    """Build the API textStyle dict and its fields mask for one style"""
+    text_style = {}
+    
+    if bold is not None:
+        text_style['bold'] = bold
+    if italic is not None:
+        text_style['italic'] = italic
+    if underline is not None:
+        text_style['underline'] = underline
+    if font_size is not None:
+        text_style['fontSize'] = {'magnitude': font_size, 'unit': 'PT'}
+    if font_family is not None:
+        text_style['weightedFontFamily'] = {'fontFamily': sys.intern(font_family)}
+    if foreground_color is not None:
+        text_style['foregroundColor'] = {'color': {'rgbColor': dict(foreground_color)}}
+    if background_color is not None:
+        text_style['backgroundColor'] = {'color': {'rgbColor': dict(background_color)}}
+    
+    # An empty style keeps the old '*' behaviour of resetting every field
+    return text_style, ','.join(text_style) or '*'
+
+def text_style_to_api(style: TextStyle) -> Tuple[Dict[str, Any], str]:
+    """
+    Convert a TextStyle to an API textStyle dict and fields mask
+    
+    Results are memoized per distinct style, so the returned dict is
+    shared between requests and must not be mutated.
+    """
+    return _build_text_style(
+        style.bold, style.italic, style.underline, style.font_size, style.font_family,
+        _color_key(style.foreground_color), _color_key(style.background_color)
+    )
+
+class DocumentCache:
+    """
+    Thread-safe in-memory document cache with expiring entries
+    
+    Each document has a generation counter that invalidate() bumps. A
+    fetch records the generation before it starts and its result is only
+    stored if no write invalidated the document in the meantime, so a
+    slow read can never repopulate the cache with pre-write content.
+    """
+    
+    def __init__(self, ttl: float = DOCUMENT_CACHE_TTL, maxsize: int = DOCUMENT_CACHE_SIZE):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.RLock()
+    
+    def get(self, document_id: str) -> Optional[Dict[str, Any]]:
+        """Return the cached document, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(document_id)
+            if entry is None:
+                return None
+            stored_at, document = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[document_id]
+                return None
+            self._entries.move_to_end(document_id)
+            return document
+    
+    def generation(self, document_id: str) -> int:
+        """Current generation of a document, to pass back to put()"""
+        with self._lock:
+            return self._generations.get(document_id, 0)
+    
+    def put(self, document_id: str, document: Dict[str, Any], generation: Optional[int] = None) -> bool:
+        """Store a document unless it was invalidated since generation was read"""
+        with self._lock:
+            if generation is not None and generation != self._generations.get(document_id, 0):
+                return False
+            self._entries[document_id] = (time.monotonic(), document)
+            self._entries.move_to_end(document_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return True
+    
+    def invalidate(self, document_id: str):
+        """Drop a document and fence off fetches that started before now"""
+        with self._lock:
+            self._entries.pop(document_id, None)
+            self._generations[document_id] = self._generations.get(document_id, 0) + 1
+
 class RequestType(Enum):
     """Supported batch request types"""
     INSERT_TEXT = "insertText"
@@ -62,11 +203,13 @@ class EnhancedGoogleDocsAPI:
     - UTF-16 index handling
     """
     
-    def __init__(self, credentials_path: str = "credentials.json", token_path: str = "token.json"):
+    def __init__(self, credentials_path: str = "credentials.json", token_path: str = "token.json",
+                 disk_cache_path: Optional[str] = None):
         self.credentials_path = credentials_path
         self.token_path = token_path
+        self.disk_cache_path = disk_cache_path
         self.service = None
-        self.document_cache = {}
+        self.document_cache = DocumentCache()
         self.batch_requests = []
         
     def authenticate(self, scope: str = 'full', use_adc: bool = False) -> Dict[str, Any]:
@@ -83,6 +226,19 @@ class EnhancedGoogleDocsAPI:
         try:
             creds = None
             
+            # Reuse an already-built service while its credentials are valid
+            cache_key = ('ADC' if use_adc else os.path.abspath(self.token_path), scope)
+            cached = _SERVICE_CACHE.get(cache_key)
+            if cached and cached[1].valid:
+                self.service = cached[0]
+                return {
+                    'success': True,
+                    'message': 'Authentication successful',
+                    'scope': scope,
+                    'method': 'ADC' if use_adc else 'OAuth2',
+                    'cached': True
+                }
+            
             if use_adc:
                 # Use Application Default Credentials
                 creds, project = google.auth.default(scopes=SCOPES[scope])
@@ -116,8 +272,9 @@ class EnhancedGoogleDocsAPI:
                         with open(self.token_path, 'w') as token:
                             token.write(creds.to_json())
             
-            # Build service
-            self.service = build('docs', 'v1', credentials=creds)
+            # Build service from the discovery document bundled with the client library
+            self.service = build('docs', 'v1', credentials=creds, static_discovery=True)
+            _SERVICE_CACHE[cache_key] = (self.service, creds)
             
             return {
                 'success': True,
@@ -144,16 +301,36 @@ class EnhancedGoogleDocsAPI:
         """
         try:
             # Check cache first
-            if document_id in self.document_cache:
+            document = self.document_cache.get(document_id)
+            if document is not None:
                 return {
                     'success': True,
-                    'document': self.document_cache[document_id],
+                    'document': document,
                     'from_cache': True
                 }
             
+            generation = self.document_cache.generation(document_id)
+            
+            # Reuse the on-disk copy if the document has not changed since;
+            # the revision is only checked when there is a copy to reuse
+            document = self._load_disk_cached_document(document_id)
+            if document:
+                revision = self.service.documents().get(
+                    documentId=document_id, fields='revisionId').execute()
+                if document.get('revisionId') == revision.get('revisionId'):
+                    self.document_cache.put(document_id, document, generation)
+                    return {
+                        'success': True,
+                        'document': document,
+                        'title': document.get('title', 'Untitled'),
+                        'revision_id': document.get('revisionId'),
+                        'from_cache': True
+                    }
+            
             # Fetch from API
             document = self.service.documents().get(documentId=document_id).execute()
-            self.document_cache[document_id] = document
+            self.document_cache.put(document_id, document, generation)
+            self._store_disk_cached_document(document_id, document)
             
             return {
                 'success': True,
@@ -170,6 +347,93 @@ class EnhancedGoogleDocsAPI:
                 'status_code': e.resp.status
             }
     
+    def get_documents_batch(self, document_ids: List[str]) -> Dict[str, Any]:
+        """
+        Retrieve several documents over one HTTP batch request
+        
+        Args:
+            document_ids: Google Docs document IDs
+        
+        Returns:
+            Documents and per-document errors keyed by document ID
+        """
+        documents = {}
+        errors = {}
+        pending = []
+        generations = {}
+        
+        for document_id in dict.fromkeys(document_ids):
+            document = self.document_cache.get(document_id)
+            if document is not None:
+                documents[document_id] = document
+            else:
+                pending.append(document_id)
+                generations[document_id] = self.document_cache.generation(document_id)
+        
+        def on_response(request_id, response, exception):
+            if exception is not None:
+                errors[request_id] = str(exception)
+            else:
+                documents[request_id] = response
+                self.document_cache.put(request_id, response, generations[request_id])
+        
+        try:
+            # The batch endpoint accepts at most 100 calls per request
+            for start in range(0, len(pending), MAX_BATCH_HTTP_CALLS):
+                batch = self.service.new_batch_http_request(callback=on_response)
+                for document_id in pending[start:start + MAX_BATCH_HTTP_CALLS]:
+                    batch.add(self.service.documents().get(documentId=document_id),
+                              request_id=document_id)
+                batch.execute()
+        except HttpError as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'status_code': e.resp.status,
+                'documents': documents
+            }
+        
+        return {
+            'success': not errors,
+            'documents': documents,
+            'errors': errors
+        }
+    
+    def _load_disk_cached_document(self, document_id: str) -> Optional[Dict[str, Any]]:
+        """Return the persisted copy of a document, if any"""
+        if not self.disk_cache_path:
+            return None
+        try:
+            with shelve.open(self.disk_cache_path, flag='r') as cache:
+                return cache.get(document_id)
+        except Exception:
+            # Missing or unreadable cache is just a cache miss
+            return None
+    
+    def _store_disk_cached_document(self, document_id: str, document: Dict[str, Any]):
+        """Persist a fetched document for later runs"""
+        if not self.disk_cache_path or not document.get('revisionId'):
+            return
+        try:
+            with shelve.open(self.disk_cache_path) as cache:
+                cache[document_id] = document
+            if self._disk_cache_size() > DISK_CACHE_MAX_BYTES:
+                # Start over with just this document
+                with shelve.open(self.disk_cache_path, flag='n') as cache:
+                    cache[document_id] = document
+        except Exception as e:
+            print(f"Warning: could not write document cache: {e}")
+    
+    def _disk_cache_size(self) -> int:
+        """Total size of the files backing the shelf (dbm backends differ
+        in which suffixes they add to the path)"""
+        directory, name = os.path.split(self.disk_cache_path)
+        total = 0
+        for entry in os.scandir(directory or '.'):
+            if entry.name.startswith(name) and entry.is_file():
+                total += entry.stat().st_size
+        return total
+    
     def add_batch_request(self, request_type: RequestType, **kwargs):
         """
         Add a request to the batch queue
@@ -183,13 +447,19 @@ class EnhancedGoogleDocsAPI:
         
         return len(self.batch_requests)
     
-    def execute_batch(self, document_id: str, write_control: Optional[str] = None) -> Dict[str, Any]:
+    def execute_batch(self, document_id: str, write_control: Optional[str] = None,
+                      chunk_size: int = MAX_BATCH_UPDATE_REQUESTS) -> Dict[str, Any]:
         """
-        Execute all queued batch requests atomically
+        Execute all queued batch requests
+        
+        Large queues are split into chunks of chunk_size requests. Each
+        chunk is applied atomically; chunks are sent in order because
+        later requests depend on the indices left by earlier ones.
         
         Args:
             document_id: Target document ID
             write_control: Optional WriteControl for state consistency
+            chunk_size: Maximum requests per batchUpdate call
             
         Returns:
             Batch execution result
@@ -200,38 +470,55 @@ class EnhancedGoogleDocsAPI:
                 'error': 'No requests in batch queue'
             }
         
+        executed_count = 0
+        replies = []
+        result = {}
+        required_revision = write_control
+        
         try:
-            body = {'requests': self.batch_requests}
-            
-            if write_control:
-                body['writeControl'] = {'requiredRevisionId': write_control}
-            
-            result = self.service.documents().batchUpdate(
-                documentId=document_id,
-                body=body
-            ).execute()
+            while executed_count < len(self.batch_requests):
+                chunk = self.batch_requests[executed_count:executed_count + chunk_size]
+                body = {'requests': chunk}
+                
+                if required_revision:
+                    body['writeControl'] = {'requiredRevisionId': required_revision}
+                
+                result = self.service.documents().batchUpdate(
+                    documentId=document_id,
+                    body=body
+                ).execute()
+                
+                executed_count += len(chunk)
+                replies.extend(result.get('replies', []))
+                
+                # Chain the revision so no outside edit lands between chunks
+                if write_control:
+                    required_revision = result.get('writeControl', {}).get('requiredRevisionId')
             
             # Clear batch queue after successful execution
-            executed_count = len(self.batch_requests)
             self.batch_requests = []
             
-            # Invalidate cache for this document
-            if document_id in self.document_cache:
-                del self.document_cache[document_id]
-            
             return {
                 'success': True,
                 'executed_requests': executed_count,
                 'document_id': result.get('documentId'),
-                'replies': result.get('replies', [])
+                'replies': replies
             }
             
         except HttpError as e:
+            # Keep only the requests that were not applied
+            self.batch_requests = self.batch_requests[executed_count:]
             return {
                 'success': False,
                 'error': str(e),
+                'executed_requests': executed_count,
                 'pending_requests': len(self.batch_requests)
             }
+        
+        finally:
+            # Invalidate cache for this document
+            if executed_count:
+                self.document_cache.invalidate(document_id)
     
     def insert_text(self, text: str, index: int, segment_id: Optional[str] = None):
         """Queue text insertion request"""
@@ -240,7 +527,7 @@ class EnhancedGoogleDocsAPI:
             'location': {'index': index}
         }
         if segment_id:
-            request['location']['segmentId'] = segment_id
+            request['location']['segmentId'] = sys.intern(segment_id)
             
         self.add_batch_request(RequestType.INSERT_TEXT, **request)
     
@@ -253,28 +540,13 @@ class EnhancedGoogleDocsAPI:
     
     def update_text_style(self, start_index: int, end_index: int, style: TextStyle):
         """Queue text style update request"""
-        text_style = {}
-        
-        if style.bold is not None:
-            text_style['bold'] = style.bold
-        if style.italic is not None:
-            text_style['italic'] = style.italic
-        if style.underline is not None:
-            text_style['underline'] = style.underline
-        if style.font_size is not None:
-            text_style['fontSize'] = {'magnitude': style.font_size, 'unit': 'PT'}
-        if style.font_family is not None:
-            text_style['weightedFontFamily'] = {'fontFamily': style.font_family}
-        if style.foreground_color is not None:
-            text_style['foregroundColor'] = {'color': {'rgbColor': style.foreground_color}}
-        if style.background_color is not None:
-            text_style['backgroundColor'] = {'color': {'rgbColor': style.background_color}}
+        text_style, fields = text_style_to_api(style)
         
         self.add_batch_request(
             RequestType.UPDATE_TEXT_STYLE,
             textStyle=text_style,
             range={'startIndex': start_index, 'endIndex': end_index},
-            fields='*'  # Update all specified fields
+            fields=fields  # Update only the specified fields
         )
     
     def replace_all_text(self, search_text: str, replace_text: str, match_case: bool = False):
@@ -294,7 +566,7 @@ class EnhancedGoogleDocsAPI:
         self.add_batch_request(
             RequestType.CREATE_PARAGRAPH_BULLETS,
             range={'startIndex': start_index, 'endIndex': end_index},
-            bulletPreset=bullet_preset
+            bulletPreset=sys.intern(bullet_preset)
         )
     
     def insert_table(self, index: int, rows: int, columns: int):
@@ -324,14 +596,36 @@ class EnhancedGoogleDocsAPI:
         Returns:
             List of TextRange objects
         """
+        return self.find_many_text_indices(document_id, [search_text]).get(search_text, [])
+    
+    def find_many_text_indices(self, document_id: str, search_texts: List[str]) -> Dict[str, List[TextRange]]:
+        """
+        Find all occurrences of several texts in one pass over the document
+        
+        Args:
+            document_id: Document to search
+            search_texts: Texts to find
+            
+        Returns:
+            Mapping of each search text to its list of TextRange objects
+        """
+        terms = list(dict.fromkeys(t for t in search_texts if t))
+        if not terms:
+            return {}
+        
         doc_result = self.get_document(document_id)
         if not doc_result['success']:
-            return []
+            return {}
         
         document = doc_result['document']
         content = document.get('body', {}).get('content', [])
         
-        ranges = []
+        ranges = {term: [] for term in terms}
+        utf16_lengths = {term: utf16_length(term) for term in terms}
+        
+        # Zero-width lookahead reports every position where any term starts,
+        # including overlapping occurrences
+        pattern = re.compile('(?=(?:%s))' % '|'.join(map(re.escape, terms)))
         
         for element in content:
             if 'paragraph' in element:
@@ -341,24 +635,23 @@ class EnhancedGoogleDocsAPI:
                         text = elem['textRun'].get('content', '')
                         start_idx = elem.get('startIndex', 0)
                         
-                        # Find all occurrences in this text run
-                        search_start = 0
-                        while True:
-                            pos = text.find(search_text, search_start)
-                            if pos == -1:
-                                break
+                        # UTF-16 offsets, built once per run and only if needed
+                        offsets = None
+                        
+                        for match in pattern.finditer(text):
+                            pos = match.start()
                             
                             # Calculate UTF-16 indices
-                            text_before = text[:pos]
-                            utf16_offset = len(text_before.encode('utf-16-le')) // 2
-                            utf16_length = len(search_text.encode('utf-16-le')) // 2
-                            
-                            ranges.append(TextRange(
-                                start_index=start_idx + utf16_offset,
-                                end_index=start_idx + utf16_offset + utf16_length
-                            ))
+                            if offsets is None:
+                                offsets = utf16_prefix_lengths(text)
+                            utf16_offset = start_idx + offsets[pos]
                             
-                            search_start = pos + 1
+                            for term in terms:
+                                if text.startswith(term, pos):
+                                    ranges[term].append(TextRange(
+                                        start_index=utf16_offset,
+                                        end_index=utf16_offset + utf16_lengths[term]
+                                    ))
         
         return ranges
     
@@ -371,30 +664,52 @@ class EnhancedGoogleDocsAPI:
         document = doc_result['document']
         content = document.get('body', {}).get('content', [])
         
-        text_parts = []
+        buffer = io.StringIO()
+        write = buffer.write
+        separator = ''  # becomes '\n' after the first part, as in '\n'.join
         
-        for element in content:
+        # Explicit stack of (structural element, inside a table cell);
+        # pushed in reverse so elements pop in document order
+        stack = [(element, False) for element in reversed(content)]
+        pop = stack.pop
+        push = stack.extend
+        
+        while stack:
+            element, in_table = pop()
+            
             if 'paragraph' in element:
-                paragraph = element['paragraph']
-                para_text = ''
-                for elem in paragraph.get('elements', []):
-                    if 'textRun' in elem:
-                        para_text += elem['textRun'].get('content', '')
-                if para_text:
-                    text_parts.append(para_text)
-            elif 'table' in element:
+                runs = []
+                for elem in element['paragraph'].get('elements', ()):
+                    try:
+                        runs.append(elem['textRun']['content'])
+                    except KeyError:
+                        if 'textRun' in elem:
+                            runs.append('')
+                
+                if in_table:
+                    # Table cells contribute one part per text run
+                    for run in runs:
+                        write(separator)
+                        write(run)
+                        separator = '\n'
+                else:
+                    para_text = ''.join(runs)
+                    if para_text:
+                        write(separator)
+                        write(para_text)
+                        separator = '\n'
+            
+            elif 'table' in element and not in_table:
                 # Extract table text
-                table = element['table']
-                for row in table.get('tableRows', []):
-                    for cell in row.get('tableCells', []):
-                        for cell_element in cell.get('content', []):
-                            if 'paragraph' in cell_element:
-                                para = cell_element['paragraph']
-                                for elem in para.get('elements', []):
-                                    if 'textRun' in elem:
-                                        text_parts.append(elem['textRun'].get('content', ''))
+                cell_elements = [
+                    (cell_element, True)
+                    for row in element['table'].get('tableRows', ())
+                    for cell in row.get('tableCells', ())
+                    for cell_element in cell.get('content', ())
+                ]
+                push(reversed(cell_elements))
         
-        return '\n'.join(text_parts)
+        return buffer.getvalue()
 
 # Example usage
 if __name__ == "__main__":
@@ -5,7 +5,10 @@ Since direct API access is blocked, use the export URL approach
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, parse_qs
 
 # Document URL
@@ -17,6 +20,9 @@ doc_id = parsed.path.split('/')[3]
 
 print(f"Document ID: {doc_id}")
 
+# Bytes read from the socket per write
+CHUNK_SIZE = 64 * 1024
+
 # Export URLs for Google Docs
 export_urls = {
     'html': f'https://docs.google.com/document/d/{doc_id}/export?format=html',
@@ -28,29 +34,44 @@ export_urls = {
 print("\nAttempting to download document in various formats...")
 print("Note: This works if the document is publicly accessible or you're logged into Google in your browser.")
 
-# Try to download each format
-for format_type, url in export_urls.items():
-    print(f"\nTrying {format_type} format...")
+def download(session, format_type, url):
+    """Download one export format, returning the lines to report"""
+    messages = [f"\nTrying {format_type} format..."]
     try:
-        response = requests.get(url, allow_redirects=True, timeout=10)
-        if response.status_code == 200:
+        with session.get(url, allow_redirects=True, timeout=10, stream=True) as response:
+            if response.status_code != 200:
+                messages.append(f"✗ Failed to download {format_type} (Status: {response.status_code})")
+                return messages
+            
+            # Stream the body straight to disk
             filename = f"bmpoa_document.{format_type}"
             with open(filename, 'wb') as f:
-                f.write(response.content)
-            print(f"✓ Successfully downloaded as {filename}")
-            
-            # If HTML, also save a cleaned version
-            if format_type == 'html':
-                # Basic cleaning
-                content = response.text
-                # Save raw HTML
-                with open('bmpoa_document_raw.html', 'w', encoding='utf-8') as f:
-                    f.write(content)
-                print(f"✓ Also saved raw HTML as bmpoa_document_raw.html")
-        else:
-            print(f"✗ Failed to download {format_type} (Status: {response.status_code})")
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    f.write(chunk)
+        messages.append(f"✓ Successfully downloaded as {filename}")
+        
+        # If HTML, also keep an untouched raw copy
+        if format_type == 'html':
+            shutil.copyfile(filename, 'bmpoa_document_raw.html')
+            messages.append(f"✓ Also saved raw HTML as bmpoa_document_raw.html")
     except Exception as e:
-        print(f"✗ Error downloading {format_type}: {str(e)}")
+        messages.append(f"✗ Error downloading {format_type}: {str(e)}")
+    return messages
+
+# Download all formats concurrently over one pooled session
+with requests.Session() as session:
+    # Keep one reusable keep-alive connection per concurrent download, for
+    # docs.google.com and the googleusercontent.com host it redirects to
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=len(export_urls))
+    session.mount('https://', adapter)
+    
+    with ThreadPoolExecutor(max_workers=len(export_urls)) as executor:
+        futures = [
+            executor.submit(download, session, format_type, url)
+            for format_type, url in export_urls.items()
+        ]
+        for future in futures:
+            print('\n'.join(future.result()))
 
 print("\n" + "="*50)
 print("Alternative approach:")
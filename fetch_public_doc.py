@@ -6,81 +6,119 @@ Since it's publicly viewable, we can analyze its content
 
 import requests
 import re
-from bs4 import BeautifulSoup
 import json
+import codecs
+import queue
+from concurrent.futures import ThreadPoolExecutor
 
 # Document URL
 doc_url = "https://docs.google.com/document/d/169fOjfUuf2j-V0HIVCS8REf3Wtl94D5Gxt67sUdgJQs/export?format=txt"
 
+# Bytes read from the socket per write
+CHUNK_SIZE = 64 * 1024
+
+def download(url, path, chunks):
+    """Stream url to path, handing every chunk to the analysis queue"""
+    try:
+        with requests.get(url, stream=True) as response:
+            response.raise_for_status()
+            with open(path, 'wb') as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    f.write(chunk)
+                    chunks.put(chunk)
+    finally:
+        # Always wake the consumer, even if the download failed
+        chunks.put(None)
+
+def analyze_lines(lines, stats, non_empty_lines, header_positions):
+    """Fold a batch of complete lines into the running statistics"""
+    for line in lines:
+        stats['total_lines'] += 1
+        stats['total_characters'] += len(line) + 1
+        stats['total_words'] += len(line.split())
+        stripped = line.strip()
+        if stripped:
+            # Headers are lines in all caps; the cheap length test runs first
+            if len(stripped) > 3 and stripped.isupper():
+                header_positions.append(len(non_empty_lines))
+            non_empty_lines.append(stripped)
+
 print("Fetching document content...")
 
 try:
-    # Download as plain text
-    response = requests.get(doc_url)
-    response.raise_for_status()
+    stats = {'total_lines': 0, 'total_characters': 0, 'total_words': 0}
+    non_empty_lines = []
+    header_positions = []
+    preview = ''
+    pending = ''
+    decoder = codecs.getincrementaldecoder('utf-8')()
     
-    content = response.text
+    # Download as plain text on a worker thread, analyzing lines as they arrive
+    chunks = queue.Queue()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        download_future = executor.submit(download, doc_url, 'bmpoa_document.txt', chunks)
+        
+        for chunk in iter(chunks.get, None):
+            text = decoder.decode(chunk)
+            if len(preview) < 1000:
+                preview += text[:1000 - len(preview)]
+            
+            # The last piece may be a partial line; carry it to the next chunk
+            *complete_lines, pending = (pending + text).split('\n')
+            analyze_lines(complete_lines, stats, non_empty_lines, header_positions)
+        
+        download_future.result()
     
-    # Basic analysis
-    lines = content.split('\n')
-    non_empty_lines = [line.strip() for line in lines if line.strip()]
+    tail = pending + decoder.decode(b'', final=True)
+    preview += tail[:1000 - len(preview)]
+    analyze_lines([tail], stats, non_empty_lines, header_positions)
+    stats['total_characters'] -= 1  # no newline after the last line
     
     print(f"\nDocument Statistics:")
-    print(f"- Total lines: {len(lines)}")
+    print(f"- Total lines: {stats['total_lines']}")
     print(f"- Non-empty lines: {len(non_empty_lines)}")
-    print(f"- Total characters: {len(content)}")
-    print(f"- Total words: {len(content.split())}")
+    print(f"- Total characters: {stats['total_characters']}")
+    print(f"- Total words: {stats['total_words']}")
     
     # Show first portion
     print(f"\nFirst 1000 characters:")
     print("-" * 60)
-    print(content[:1000])
+    print(preview)
     print("-" * 60)
     
-    # Save full content
-    with open('bmpoa_document.txt', 'w', encoding='utf-8') as f:
-        f.write(content)
     print(f"\nFull document saved to: bmpoa_document.txt")
     
     # Analyze structure
     print("\nDocument Structure Analysis:")
     
-    # Look for headers (lines in all caps)
-    headers = [line for line in non_empty_lines if line.isupper() and len(line) > 3]
+    # Headers were located while the lines streamed in
+    headers = [non_empty_lines[i] for i in header_positions]
     print(f"\nPotential headers found: {len(headers)}")
     for i, header in enumerate(headers[:10]):
         print(f"  {i+1}. {header}")
     
-    # Look for sections
-    sections = []
-    current_section = None
-    
-    for line in non_empty_lines:
-        if line.isupper() and len(line) > 3:
-            if current_section:
-                sections.append(current_section)
-            current_section = {'title': line, 'content': []}
-        elif current_section:
-            current_section['content'].append(line)
-    
-    if current_section:
-        sections.append(current_section)
+    # Each section runs from its header to the next one
+    section_ends = header_positions[1:] + [len(non_empty_lines)]
+    sections = [
+        {'title': non_empty_lines[start], 'content': non_empty_lines[start + 1:end]}
+        for start, end in zip(header_positions, section_ends)
+    ]
     
     print(f"\nSections identified: {len(sections)}")
     
     # Save structured data
     with open('bmpoa_structure.json', 'w') as f:
-        json.dump({
+        f.write(json.dumps({
             'statistics': {
-                'total_lines': len(lines),
+                'total_lines': stats['total_lines'],
                 'non_empty_lines': len(non_empty_lines),
-                'total_characters': len(content),
-                'total_words': len(content.split()),
+                'total_characters': stats['total_characters'],
+                'total_words': stats['total_words'],
                 'sections': len(sections)
             },
             'headers': headers,
             'sections': sections[:10]  # First 10 sections for review
-        }, f, indent=2)
+        }, indent=2))
     
     print("\nStructured data saved to: bmpoa_structure.json")
     
@@ -5,8 +5,38 @@ Generate comprehensive report on BMPOA document with editing recommendations
 
 import json
 import re
+from collections import Counter
 from datetime import datetime
 
+# Phone formats, keyed by the named group that matches them
+PHONE_FORMATS = {
+    'phone_dash': 'XXX-XXX-XXXX',
+    'phone_paren': '(XXX) XXX-XXXX',
+    'phone_dot': 'XXX.XXX.XXXX'
+}
+
+# Every contact and date token the report looks for, matched in one scan
+TOKEN_PATTERN = re.compile(
+    r'(?P<phone_dash>\d{3}-\d{3}-\d{4})'
+    r'|(?P<phone_paren>\(\d{3}\)\s*\d{3}-\d{4})'
+    r'|(?P<phone_dot>\d{3}\.\d{3}\.\d{4})'
+    r'|(?P<url>https?://[^\s]+)'
+    r'|(?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b)'
+    r'|(?P<year>\b(?:19|20)\d{2}\b)'
+)
+
+# Keywords tracked in the content analysis
+EMERGENCY_KEYWORDS = ['emergency', '911', 'evacuation', 'fire', 'safety']
+GOVERNANCE_KEYWORDS = ['board', 'committee', 'meeting', 'vote', 'bylaws', 'covenant']
+AMENITY_KEYWORDS = ['lodge', 'lake', 'trail', 'recreation', 'playground', 'pool']
+KEYWORD_PATTERN = re.compile(
+    r'\b(' + '|'.join(map(re.escape, EMERGENCY_KEYWORDS + GOVERNANCE_KEYWORDS + AMENITY_KEYWORDS)) + r')\b',
+    re.IGNORECASE
+)
+
+# Loose phone match used for the quick-reference summary
+SUMMARY_PHONE_PATTERN = re.compile(r'[\d\(\)\.\-\s]{10,}')
+
 def generate_report():
     # Load the structured data
     with open('bmpoa_structured.json', 'r') as f:
@@ -51,19 +81,24 @@ def generate_report():
     report.append("\nCONTACT INFORMATION AUDIT")
     report.append("-" * 40)
     
-    # Find all phone numbers
-    phone_patterns = [
-        (r'\d{3}-\d{3}-\d{4}', 'XXX-XXX-XXXX'),
-        (r'\(\d{3}\)\s*\d{3}-\d{4}', '(XXX) XXX-XXXX'),
-        (r'\d{3}\.\d{3}\.\d{4}', 'XXX.XXX.XXXX')
-    ]
+    # Classify every phone, email, URL and year in a single scan,
+    # keeping distinct values and how often each kind occurred
+    tokens = {group: set() for group in PHONE_FORMATS}
+    tokens.update(url=set(), email=set(), year=set())
+    token_counts = Counter()
+    for match in TOKEN_PATTERN.finditer(content):
+        tokens[match.lastgroup].add(match.group())
+        token_counts[match.lastgroup] += 1
+    
+    # Count all tracked keywords in one pass for the sections below
+    keyword_counts = Counter(m.group(1).lower() for m in KEYWORD_PATTERN.finditer(content))
     
+    # Find all phone numbers
     phones_found = []
-    for pattern, format_name in phone_patterns:
-        matches = re.findall(pattern, content)
-        if matches:
-            phones_found.append(f"  Format '{format_name}': {len(matches)} instances")
-            for phone in set(matches):
+    for group, format_name in PHONE_FORMATS.items():
+        if token_counts[group]:
+            phones_found.append(f"  Format '{format_name}': {token_counts[group]} instances")
+            for phone in tokens[group]:
                 phones_found.append(f"    - {phone}")
     
     if phones_found:
@@ -71,17 +106,17 @@ def generate_report():
         report.extend(phones_found)
     
     # Find all emails
-    emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', content)
+    emails = sorted(tokens['email'])
     if emails:
         report.append("\nEmail Addresses Found:")
-        for email in sorted(set(emails)):
+        for email in emails:
             report.append(f"  - {email}")
     
     # Find all URLs
-    urls = re.findall(r'https?://[^\s]+', content)
+    urls = sorted(tokens['url'])
     if urls:
         report.append("\nWebsites Found:")
-        for url in sorted(set(urls)):
+        for url in urls:
             report.append(f"  - {url}")
     report.append("")
     
@@ -91,25 +126,22 @@ def generate_report():
     
     # Emergency Information
     report.append("\n1. EMERGENCY & SAFETY INFORMATION")
-    emergency_keywords = ['emergency', '911', 'evacuation', 'fire', 'safety']
-    for keyword in emergency_keywords:
-        count = len(re.findall(r'\b' + keyword + r'\b', content, re.IGNORECASE))
+    for keyword in EMERGENCY_KEYWORDS:
+        count = keyword_counts[keyword]
         if count > 0:
             report.append(f"   - '{keyword}' mentioned {count} times")
     
     # Governance
     report.append("\n2. GOVERNANCE STRUCTURE")
-    governance_keywords = ['board', 'committee', 'meeting', 'vote', 'bylaws', 'covenant']
-    for keyword in governance_keywords:
-        count = len(re.findall(r'\b' + keyword + r'\b', content, re.IGNORECASE))
+    for keyword in GOVERNANCE_KEYWORDS:
+        count = keyword_counts[keyword]
         if count > 0:
             report.append(f"   - '{keyword}' mentioned {count} times")
     
     # Amenities
     report.append("\n3. COMMUNITY AMENITIES")
-    amenity_keywords = ['lodge', 'lake', 'trail', 'recreation', 'playground', 'pool']
-    for keyword in amenity_keywords:
-        count = len(re.findall(r'\b' + keyword + r'\b', content, re.IGNORECASE))
+    for keyword in AMENITY_KEYWORDS:
+        count = keyword_counts[keyword]
         if count > 0:
             report.append(f"   - '{keyword}' mentioned {count} times")
     
@@ -128,12 +160,9 @@ def generate_report():
     
     # Check for date references
     current_year = datetime.now().year
-    year_pattern = r'\b(19|20)\d{2}\b'
-    years_found = re.findall(year_pattern, content)
-    if years_found:
-        old_years = [y for y in years_found if int(y) < current_year - 2]
-        if old_years:
-            report.append(f"1. Update outdated year references: {sorted(set(old_years))}")
+    old_years = sorted(y for y in tokens['year'] if int(y) < current_year - 2)
+    if old_years:
+        report.append(f"1. Update outdated year references: {old_years}")
     
     # Check section balance
     section_sizes = stats.get('section_sizes', [])
@@ -171,15 +200,15 @@ def generate_report():
         'last_analyzed': datetime.now().isoformat(),
         'key_topics': dict(stats['most_common_terms'][:10]),
         'contacts': {
-            'emails': sorted(set(emails)) if emails else [],
-            'phones': list(set(re.findall(r'[\d\(\)\.\-\s]{10,}', content))),
-            'websites': sorted(set(urls)) if urls else []
+            'emails': emails,
+            'phones': list({m.group() for m in SUMMARY_PHONE_PATTERN.finditer(content)}),
+            'websites': urls
         },
         'recommendations_count': len(data.get('suggestions', [])) + 3
     }
     
     with open('bmpoa_summary.json', 'w') as f:
-        json.dump(summary, f, indent=2)
+        f.write(json.dumps(summary, indent=2))
     
     print(f"Summary data saved to: bmpoa_summary.json")
 
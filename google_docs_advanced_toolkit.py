@@ -4,61 +4,363 @@ Google Docs Advanced Toolkit
 Comprehensive toolkit covering all Google Docs API features
 """
 
+import os
 import json
+import asyncio
+import logging
 import base64
+import difflib
+import threading
+import time
 import requests
-from typing import List, Dict, Optional, Tuple, Any
-from enum import Enum
-from dataclasses import dataclass
+import httplib2
+import google_auth_httplib2
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import (
+    List, Dict, Optional, Tuple, Any, Callable, Iterable, Iterator, NamedTuple, Final, Literal, get_type_hints
+)
+from dataclasses import dataclass, field, fields, replace, MISSING
+from functools import lru_cache, partial
+from itertools import islice
+from contextlib import contextmanager
+from operator import attrgetter
 from google.oauth2 import service_account
+from google.auth.transport.requests import AuthorizedSession
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaIoBaseDownload, build_http
+from googleapiclient.model import JsonModel
+
+
+# Per-call successes are logged at DEBUG, whole operations at INFO and
+# failures at ERROR; no handlers are added, so applications decide where
+# (and whether) they are written. The demos read BMPOA_LOGLEVEL.
+logger = logging.getLogger('gdocs_toolkit')
 
 
 # ============================================================================
-# ENUMS AND DATA CLASSES
+# CONSTANTS AND DATA CLASSES
 # ============================================================================
 
-class ParagraphAlignment(Enum):
-    """Paragraph alignment options"""
-    START = "START"
-    CENTER = "CENTER"
-    END = "END"
-    JUSTIFIED = "JUSTIFIED"
+# Payload strings shipped to the API as-is; the Literal aliases type the
+# parameters statically and the frozensets validate input at runtime
 
+# Paragraph alignment options
+ALIGN_START: Final = "START"
+ALIGN_CENTER: Final = "CENTER"
+ALIGN_END: Final = "END"
+ALIGN_JUSTIFIED: Final = "JUSTIFIED"
+AlignmentT = Literal["START", "CENTER", "END", "JUSTIFIED"]
+VALID_ALIGNMENTS = frozenset({ALIGN_START, ALIGN_CENTER, ALIGN_END, ALIGN_JUSTIFIED})
 
-class NamedStyleType(Enum):
-    """Document style types"""
-    NORMAL_TEXT = "NORMAL_TEXT"
-    TITLE = "TITLE"
-    SUBTITLE = "SUBTITLE"
-    HEADING_1 = "HEADING_1"
-    HEADING_2 = "HEADING_2"
-    HEADING_3 = "HEADING_3"
-    HEADING_4 = "HEADING_4"
-    HEADING_5 = "HEADING_5"
-    HEADING_6 = "HEADING_6"
+# Document style types
+STYLE_NORMAL_TEXT: Final = "NORMAL_TEXT"
+STYLE_TITLE: Final = "TITLE"
+STYLE_SUBTITLE: Final = "SUBTITLE"
+STYLE_HEADING_1: Final = "HEADING_1"
+STYLE_HEADING_2: Final = "HEADING_2"
+STYLE_HEADING_3: Final = "HEADING_3"
+STYLE_HEADING_4: Final = "HEADING_4"
+STYLE_HEADING_5: Final = "HEADING_5"
+STYLE_HEADING_6: Final = "HEADING_6"
+NamedStyleT = Literal[
+    "NORMAL_TEXT", "TITLE", "SUBTITLE", "HEADING_1", "HEADING_2",
+    "HEADING_3", "HEADING_4", "HEADING_5", "HEADING_6"
+]
+VALID_NAMED_STYLES = frozenset({
+    STYLE_NORMAL_TEXT, STYLE_TITLE, STYLE_SUBTITLE,
+    STYLE_HEADING_1, STYLE_HEADING_2, STYLE_HEADING_3,
+    STYLE_HEADING_4, STYLE_HEADING_5, STYLE_HEADING_6
+})
 
+# List style types
+GLYPH_BULLET: Final = "GLYPH_TYPE_UNSPECIFIED"
+GLYPH_DECIMAL: Final = "DECIMAL"
+GLYPH_ALPHA: Final = "ALPHA"
+GLYPH_ALPHA_UPPER: Final = "ALPHA_UPPER"
+GLYPH_ROMAN: Final = "ROMAN"
+GLYPH_ROMAN_UPPER: Final = "ROMAN_UPPER"
+GlyphT = Literal[
+    "GLYPH_TYPE_UNSPECIFIED", "DECIMAL", "ALPHA", "ALPHA_UPPER", "ROMAN", "ROMAN_UPPER"
+]
+VALID_GLYPH_TYPES = frozenset({
+    GLYPH_BULLET, GLYPH_DECIMAL, GLYPH_ALPHA,
+    GLYPH_ALPHA_UPPER, GLYPH_ROMAN, GLYPH_ROMAN_UPPER
+})
 
-class ListGlyphType(Enum):
-    """List style types"""
-    BULLET = "GLYPH_TYPE_UNSPECIFIED"
-    DECIMAL = "DECIMAL"
-    ALPHA = "ALPHA"
-    ALPHA_UPPER = "ALPHA_UPPER"
-    ROMAN = "ROMAN"
-    ROMAN_UPPER = "ROMAN_UPPER"
+# Section break types
+SECTION_UNDEFINED: Final = "SECTION_TYPE_UNSPECIFIED"
+SECTION_CONTINUOUS: Final = "CONTINUOUS"
+SECTION_NEXT_PAGE: Final = "NEXT_PAGE"
+SectionT = Literal["SECTION_TYPE_UNSPECIFIED", "CONTINUOUS", "NEXT_PAGE"]
+VALID_SECTION_TYPES = frozenset({SECTION_UNDEFINED, SECTION_CONTINUOUS, SECTION_NEXT_PAGE})
 
+# Block kinds for append_section
+BLOCK_PARAGRAPH: Final = "paragraph"
+BLOCK_PAGE_BREAK: Final = "page_break"
+BLOCK_TABLE: Final = "table"
+BLOCK_IMAGE: Final = "image"
+BlockKindT = Literal["paragraph", "page_break", "table", "image"]
+VALID_BLOCK_KINDS = frozenset({BLOCK_PARAGRAPH, BLOCK_PAGE_BREAK, BLOCK_TABLE, BLOCK_IMAGE})
 
-class SectionType(Enum):
-    """Section break types"""
-    UNDEFINED = "SECTION_TYPE_UNSPECIFIED"
-    CONTINUOUS = "CONTINUOUS"
-    NEXT_PAGE = "NEXT_PAGE"
 
+def pack_rgb(red: float, green: float, blue: float) -> int:
+    """Pack RGB 0-1 floats into a 0xRRGGBB int (8 bits per channel)"""
+    return (round(red * 255) << 16) | (round(green * 255) << 8) | round(blue * 255)
 
-@dataclass
-class TextStyle:
+
+def unpack_rgb(color: int) -> Tuple[float, float, float]:
+    """Expand a packed 0xRRGGBB int back to RGB 0-1 floats"""
+    return ((color >> 16 & 0xFF) / 255, (color >> 8 & 0xFF) / 255, (color & 0xFF) / 255)
+
+
+@lru_cache(maxsize=512)
+def rgb_color(color: int) -> Dict:
+    """Build the API color object for a packed 0xRRGGBB int
+    
+    Cached per color, so the result is shared and must not be mutated.
+    """
+    red, green, blue = unpack_rgb(color)
+    return {'color': {'rgbColor': {'red': red, 'green': green, 'blue': blue}}}
+
+
+class BorderSpec(NamedTuple):
+    """Paragraph border; hashable so identical borders can be shared"""
+    color: int  # packed 0xRRGGBB
+    width: float  # points
+    dash: str = 'SOLID'  # SOLID, DOT or DASH
+    padding: float = 0  # points
+    
+    def to_api(self) -> Dict:
+        """Build the API ParagraphBorder object"""
+        return {
+            'color': rgb_color(self.color),
+            'width': {'magnitude': self.width, 'unit': 'PT'},
+            'dashStyle': self.dash,
+            'padding': {'magnitude': self.padding, 'unit': 'PT'}
+        }
+
+
+@lru_cache(maxsize=256)
+def make_border(color: int, width: float, dash: str = 'SOLID',
+                padding: float = 0) -> BorderSpec:
+    """Return a shared BorderSpec for repeated border styles"""
+    return BorderSpec(color, width, dash, padding)
+
+
+NO_BORDERS = (None, None, None, None)
+
+
+def _identity_then_fields_eq(self, other):
+    """Equality with an identity fast path for shared style instances"""
+    if self is other:
+        return True
+    if other.__class__ is not self.__class__:
+        return NotImplemented
+    field_values = self._field_values
+    return field_values(self) == field_values(other)
+
+
+def _slots_getstate(self):
+    return [getattr(self, name) for name in self.__slots__]
+
+
+def _slots_setstate(self, state):
+    # The frozen __setattr__ would refuse; write the slots directly
+    for name, value in zip(self.__slots__, state):
+        object.__setattr__(self, name, value)
+
+
+def _add_slots(cls):
+    """Rebuild a dataclass with __slots__ (dataclass(slots=True) needs 3.10+)"""
+    field_names = tuple(f.name for f in fields(cls))
+    namespace = dict(cls.__dict__)
+    namespace['__slots__'] = field_names
+    if '_API_FIELDS' in namespace:
+        # Bitmap of the _API_FIELDS entries that are set, filled in by __init__
+        namespace['__slots__'] += ('_present',)
+    # Field names cached once so serializers never re-walk fields()
+    namespace['_FIELDS'] = field_names
+    namespace['_FIELDS_FROZEN'] = frozenset(field_names)
+    namespace['_DEFAULTS'] = {f.name: f.default for f in fields(cls)}
+    if cls.__dataclass_params__.eq:
+        # attrgetter builds the comparison tuple in C; the generated
+        # __hash__ stays as it already agrees with this
+        namespace['_field_values'] = attrgetter(*field_names)
+        namespace['__eq__'] = _identity_then_fields_eq
+    # Defaults are baked into the generated __init__, so the class
+    # attributes can go; they would otherwise clash with the slots
+    for name in field_names:
+        namespace.pop(name, None)
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+    if cls.__dataclass_params__.frozen:
+        # Without a __dict__, pickle and copy restore the slots through
+        # setattr, which a frozen class rejects (as dataclass(slots=True)
+        # did before Python 3.11)
+        namespace['__getstate__'] = _slots_getstate
+        namespace['__setstate__'] = _slots_setstate
+    slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+    # The frozen __setattr__/__delattr__ close over the class they were
+    # generated for; point them at the rebuilt one
+    for value in namespace.values():
+        for cell in getattr(value, '__closure__', None) or ():
+            if cell.cell_contents is cls:
+                cell.cell_contents = slotted
+    return slotted
+
+
+# How each kind of style field is tested and written into an API payload,
+# as (condition on v, value expression); used by _add_emitter
+_EMIT_KINDS = {
+    'value': ('v is not None', 'v'),
+    'truthy': ('v', 'v'),
+    'points': ('v is not None', "{'magnitude': v, 'unit': 'PT'}"),
+    'size': ('v', "{'magnitude': v, 'unit': 'PT'}"),
+    'font': ('v', "{'fontFamily': v}"),
+    'link': ('v', "{'url': v}"),
+    'color': ('v is not None', 'rgb_color(v)'),
+    'border': ('v is not None', 'v.to_api()'),
+}
+
+
+def _add_emitter(cls):
+    """Add _emit(), which builds the API payload from the _present bitmap
+    
+    _emit() returns the API style dict and its comma-joined fields mask.
+    It only visits the bits that are set, so a sparse style costs work in
+    proportion to the fields it uses, and the mask string for each
+    combination is joined once and then reused.
+    """
+    api_names = tuple(api_name for _, api_name, _ in cls._API_FIELDS)
+    
+    @lru_cache(maxsize=256)
+    def mask_for(bits):
+        return ','.join(name for i, name in enumerate(api_names) if bits >> i & 1)
+    
+    # One small generated getter per field, indexed by its bit
+    lines = []
+    for i, (attribute, _, kind) in enumerate(cls._API_FIELDS):
+        lines.append(f'def get_{i}(self):')
+        lines.append(f'    v = self.{attribute}')
+        lines.append(f'    return {_EMIT_KINDS[kind][1]}')
+    namespace = {'rgb_color': rgb_color}
+    exec('\n'.join(lines), namespace)
+    emitters = tuple((api_name, namespace[f'get_{i}'])
+                     for i, api_name in enumerate(api_names))
+    
+    def _emit(self):
+        out = {}
+        bits = present = self._present
+        while bits:
+            low = bits & -bits
+            api_name, get = emitters[low.bit_length() - 1]
+            out[api_name] = get(self)
+            bits ^= low
+        return out, mask_for(present)
+    
+    cls._emit = _emit
+    cls._ALL_FIELDS_MASK = mask_for((1 << len(api_names)) - 1)
+    return cls
+
+
+def _add_builder(cls):
+    """Generate __init__ and _from_dict(), which fill the slots directly
+    
+    The dataclass __init__ of a frozen class routes every field through
+    object.__setattr__; writing through the slot descriptors skips that.
+    Classes with _API_FIELDS also record which fields are set in _present.
+    """
+    namespace = {'new': object.__new__, 'cls': cls}
+    params = []
+    init_lines = []
+    dict_lines = ['def _from_dict(values):', '    self = new(cls)']
+    for i, f in enumerate(fields(cls)):
+        namespace[f'set_{i}'] = cls.__dict__[f.name].__set__
+        init_lines.append(f'    set_{i}(self, {f.name})')
+        if f.default is MISSING:
+            params.append(f.name)
+            dict_lines.append(f'    set_{i}(self, values[{f.name!r}])')
+        else:
+            namespace[f'default_{i}'] = f.default
+            params.append(f'{f.name}=default_{i}')
+            dict_lines.append(f'    set_{i}(self, values.get({f.name!r}, default_{i}))')
+    
+    tail = []
+    if hasattr(cls, '__post_init__'):
+        tail.append('    self.__post_init__()')
+    if '_API_FIELDS' in cls.__dict__:
+        namespace['set_present'] = cls.__dict__['_present'].__set__
+        tail.append('    bits = 0')
+        for i, (attribute, _, kind) in enumerate(cls._API_FIELDS):
+            tail.append(f'    v = self.{attribute}')
+            tail.append(f'    if {_EMIT_KINDS[kind][0]}:')
+            tail.append(f'        bits |= {1 << i}')
+        tail.append('    set_present(self, bits)')
+    
+    lines = [f"def __init__(self, {', '.join(params)}):"] + init_lines + tail
+    lines += dict_lines + tail + ['    return self']
+    exec('\n'.join(lines), namespace)
+    namespace['__init__'].__qualname__ = f'{cls.__qualname__}.__init__'
+    cls.__init__ = namespace['__init__']
+    cls._from_dict = staticmethod(namespace['_from_dict'])
+    return cls
+
+
+def optimized_style(cls):
+    """Turn a style class into a frozen, slotted dataclass
+    
+    Every style class gets the same treatment: cached field names,
+    identity-first equality, a generated __init__ and bulk builder,
+    resolved type hints and, when it declares _API_FIELDS, a presence
+    bitmap driving _emit().
+    """
+    cls = _add_slots(dataclass(frozen=True, repr=False)(cls))
+    _add_builder(cls)
+    if '_API_FIELDS' in cls.__dict__:
+        _add_emitter(cls)
+    # Resolve the annotations once; introspecting code reads _TYPE_HINTS
+    # instead of paying for get_type_hints() on every call
+    cls._TYPE_HINTS = get_type_hints(cls)
+    return cls
+
+
+class _StyleBase:
+    """Shared helpers for the style value classes"""
+    __slots__ = ()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the fields that differ from their defaults, for logging or debugging"""
+        values = {}
+        for name, default in self._DEFAULTS.items():
+            value = getattr(self, name)
+            if value != default:
+                values[name] = value
+        return values
+    
+    def as_key(self) -> Tuple:
+        """Return the field values as a plain tuple, for keying external caches"""
+        return self._field_values(self)
+    
+    @classmethod
+    def from_dicts(cls, dicts: Iterable[Dict[str, Any]]) -> List[Any]:
+        """Build many styles at once from dicts of field values"""
+        build = cls._from_dict
+        known = cls._FIELDS_FROZEN
+        styles = []
+        for values in dicts:
+            if not known.issuperset(values):
+                unknown = ', '.join(sorted(set(values) - known))
+                raise TypeError(f"{cls.__name__} got unexpected fields: {unknown}")
+            styles.append(build(values))
+        return styles
+
+
+@optimized_style
+class TextStyle(_StyleBase):
     """Comprehensive text styling options"""
     bold: Optional[bool] = None
     italic: Optional[bool] = None
@@ -66,18 +368,40 @@ class TextStyle:
     strikethrough: Optional[bool] = None
     small_caps: Optional[bool] = None
     font_family: Optional[str] = None
-    font_size: Optional[int] = None  # in points
-    foreground_color: Optional[Tuple[float, float, float]] = None  # RGB 0-1
-    background_color: Optional[Tuple[float, float, float]] = None  # RGB 0-1
+    font_size: int = 0  # in points; 0 leaves it unset
+    foreground_color: Optional[int] = None  # packed 0xRRGGBB
+    background_color: Optional[int] = None  # packed 0xRRGGBB
     link_url: Optional[str] = None
     baseline_offset: Optional[str] = None  # SUPERSCRIPT or SUBSCRIPT
     
+    # (attribute, API name, emit kind) in request order
+    _API_FIELDS = (
+        ('bold', 'bold', 'value'),
+        ('italic', 'italic', 'value'),
+        ('underline', 'underline', 'value'),
+        ('strikethrough', 'strikethrough', 'value'),
+        ('small_caps', 'smallCaps', 'value'),
+        ('font_family', 'weightedFontFamily', 'font'),
+        ('font_size', 'fontSize', 'size'),
+        ('foreground_color', 'foregroundColor', 'color'),
+        ('background_color', 'backgroundColor', 'color'),
+        ('link_url', 'link', 'link'),
+        ('baseline_offset', 'baselineOffset', 'truthy'),
+    )
+    
+    def __post_init__(self):
+        # Callers may still pass RGB 0-1 tuples; store them packed
+        if isinstance(self.foreground_color, (tuple, list)):
+            object.__setattr__(self, 'foreground_color', pack_rgb(*self.foreground_color))
+        if isinstance(self.background_color, (tuple, list)):
+            object.__setattr__(self, 'background_color', pack_rgb(*self.background_color))
+    
 
-@dataclass
-class ParagraphStyle:
+@optimized_style
+class ParagraphStyle(_StyleBase):
     """Comprehensive paragraph styling options"""
-    alignment: Optional[ParagraphAlignment] = None
-    line_spacing: Optional[float] = None  # 100 = single, 150 = 1.5x, 200 = double
+    alignment: Optional[AlignmentT] = None
+    line_spacing: float = 0  # 100 = single, 150 = 1.5x, 200 = double; 0 leaves it unset
     space_above: Optional[int] = None  # points
     space_below: Optional[int] = None  # points
     indent_first_line: Optional[int] = None  # points
@@ -86,33 +410,383 @@ class ParagraphStyle:
     keep_lines_together: Optional[bool] = None
     keep_with_next: Optional[bool] = None
     avoid_widow_and_orphan: Optional[bool] = None
-    border_top: Optional[Dict] = None
-    border_bottom: Optional[Dict] = None
-    border_left: Optional[Dict] = None
-    border_right: Optional[Dict] = None
+    # (top, bottom, left, right); the shared NO_BORDERS default keeps the
+    # common borderless case to a single pointer
+    borders: Tuple[Optional[BorderSpec], ...] = NO_BORDERS
+    
+    @property
+    def border_top(self) -> Optional[BorderSpec]:
+        return self.borders[0]
+    
+    @property
+    def border_bottom(self) -> Optional[BorderSpec]:
+        return self.borders[1]
+    
+    @property
+    def border_left(self) -> Optional[BorderSpec]:
+        return self.borders[2]
+    
+    @property
+    def border_right(self) -> Optional[BorderSpec]:
+        return self.borders[3]
+    
+    # (attribute, API name, emit kind) in request order
+    _API_FIELDS = (
+        ('alignment', 'alignment', 'truthy'),
+        ('line_spacing', 'lineSpacing', 'truthy'),
+        ('space_above', 'spaceAbove', 'points'),
+        ('space_below', 'spaceBelow', 'points'),
+        ('indent_first_line', 'indentFirstLine', 'points'),
+        ('indent_start', 'indentStart', 'points'),
+        ('indent_end', 'indentEnd', 'points'),
+        ('keep_lines_together', 'keepLinesTogether', 'value'),
+        ('keep_with_next', 'keepWithNext', 'value'),
+        ('avoid_widow_and_orphan', 'avoidWidowAndOrphan', 'value'),
+        ('borders[0]', 'borderTop', 'border'),
+        ('borders[1]', 'borderBottom', 'border'),
+        ('borders[2]', 'borderLeft', 'border'),
+        ('borders[3]', 'borderRight', 'border'),
+    )
 
 
-@dataclass
-class TableStyle:
+def _freeze(value: Any) -> Any:
+    """Turn nested dicts and lists into sorted item tuples and tuples"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw_items(items: Tuple) -> Dict:
+    """Rebuild the dict a _freeze()d dict came from"""
+    return {key: _thaw_items(item) if _is_frozen_dict(item) else item
+            for key, item in items}
+
+
+def _is_frozen_dict(value: Any) -> bool:
+    return (isinstance(value, tuple) and bool(value)
+            and all(isinstance(item, tuple) and len(item) == 2
+                    and isinstance(item[0], str) for item in value))
+
+
+@optimized_style
+class TableStyle(_StyleBase):
     """Table styling options"""
     rows: int
     columns: int
-    table_column_properties: Optional[List[Dict]] = None
+    # One entry per column, each stored as _freeze()d items so the style
+    # stays hashable; column_properties() gives the API dicts back
+    table_column_properties: Tuple[Tuple, ...] = ()
     content_direction: Optional[str] = None  # LTR or RTL
+    
+    def __post_init__(self):
+        # Callers may still pass the columns as dicts; store them frozen
+        if any(isinstance(column, dict) for column in self.table_column_properties):
+            object.__setattr__(self, 'table_column_properties', tuple(
+                _freeze(column) for column in self.table_column_properties
+            ))
+    
+    def add_column(self, properties: Dict) -> 'TableStyle':
+        """Return a copy with one more column's properties appended"""
+        return replace(self, table_column_properties=self.table_column_properties + (_freeze(properties),))
+    
+    def column_properties(self) -> List[Dict]:
+        """Return the tableColumnProperties payload"""
+        return [_thaw_items(column) for column in self.table_column_properties]
+
+
+# Recurring styles (headings, body, captions) are rendered once; the returned
+# dicts are shared by every request that uses them and must not be mutated
+@lru_cache(maxsize=4096)
+def render_text_style(style: TextStyle) -> Tuple[Dict, str]:
+    """Return the cached (textStyle dict, fields mask) for a TextStyle"""
+    return style._emit()
+
+
+@lru_cache(maxsize=4096)
+def render_paragraph_style(style: ParagraphStyle) -> Tuple[Dict, str]:
+    """Return the cached (paragraphStyle dict, fields mask) for a ParagraphStyle"""
+    return style._emit()
+
+
+def _named_range_id(reply: Dict) -> str:
+    return reply['createNamedRange']['namedRangeId']
+
+
+# Opt-in on-disk HTTP cache for Docs API reads: pass
+# http_cache_dir=HTTP_CACHE_DIR to keep responses that carry an ETag and
+# revalidate them with If-None-Match. Entries are plaintext copies of the
+# documents read, so the cache is off by default and pruned, oldest first,
+# to HTTP_CACHE_MAX_BYTES whenever a client is built on it.
+HTTP_CACHE_DIR = '~/.bmpoa_http_cache'
+HTTP_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# In-memory reuse of metadata and revision reads. The default TTL of 0
+# sends every read; a few seconds lets interactive bursts skip the round
+# trip. This toolkit's own writes always drop the document's entries.
+READ_CACHE_TTL = 0
+READ_CACHE_SIZE = 128
+
+# Whole documents kept by _get_document. Each reuse costs a revisionId-only
+# GET instead of the full body, so this holds regardless of read_cache_ttl.
+DOCUMENT_CACHE_SIZE = 16
+
+# Revisions fetched per Drive revisions.list call by iter_revisions
+REVISIONS_PAGE_SIZE = 30
+
+# Top-level keys returned by get_document_metadata; asking for just these
+# keeps body.content out of the response
+METADATA_FIELDS = (
+    'title,documentId,revisionId,suggestionsViewMode,documentStyle,namedStyles,'
+    'lists,namedRanges,positionedObjects,inlineObjects,footnotes,headers,footers'
+)
+
+
+def _prune_http_cache(directory: str, max_bytes: int):
+    """Delete the least recently written cache files until the directory
+    holds at most max_bytes"""
+    try:
+        entries = [entry for entry in os.scandir(directory) if entry.is_file()]
+    except OSError:
+        return
+    
+    stats = []
+    for entry in entries:
+        try:
+            stat = entry.stat()
+        except OSError:
+            continue
+        stats.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in stats)
+    for _, size, path in sorted(stats):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def compact_json(body: Any) -> str:
+    """Serialize a request body without the default ', '/': ' padding"""
+    return json.dumps(body, separators=(',', ':'))
+
+
+class CompactJsonModel(JsonModel):
+    """JsonModel whose request bodies are serialized with compact_json
+    
+    batchUpdate bodies with thousands of requests shrink by the padding
+    json.dumps would otherwise add after every key and item.
+    """
+    
+    def serialize(self, body_value):
+        if isinstance(body_value, dict) and 'data' not in body_value and self._data_wrapper:
+            body_value = {'data': body_value}
+        return compact_json(body_value)
+
+# REST endpoint and connection pool size for the multi-document helpers
+DOCS_API_URL = 'https://docs.googleapis.com/v1/documents'
+MAX_CONCURRENT_REQUESTS = 16
+
+def _metadata_from(doc: Dict) -> Dict:
+    return {key: doc.get(key) for key in METADATA_FIELDS.split(',')}
+
+
+# Attempts after the first for 429/5xx responses and dropped connections;
+# both the discovery clients and the pooled session back off exponentially
+MAX_RETRIES = 5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# The pooled session retries idempotent methods only; a batchUpdate POST
+# that timed out may already have been applied, so _rest_batch_update
+# retries it itself, pinned to the revision it was written against
+SESSION_RETRY = Retry(
+    total=MAX_RETRIES,
+    backoff_factor=1,
+    status_forcelist=RETRY_STATUSES,
+    raise_on_status=False,  # leave the final response to raise_for_status()
+)
+
+# Calls per multipart request for the *_batched helpers (Drive's limit)
+MAX_BATCH_HTTP_REQUESTS = 100
+
+
+def _points(value) -> Dict:
+    return {'magnitude': value, 'unit': 'PT'}
+
+
+def _as_is(value):
+    return value
+
+
+# (API name, converter) for update_document_style, in parameter order
+_DOCUMENT_STYLE_SPEC = (
+    ('marginTop', _points),
+    ('marginBottom', _points),
+    ('marginLeft', _points),
+    ('marginRight', _points),
+    ('pageSize', _as_is),
+    ('useCustomHeaderFooterMargins', _as_is),
+)
+
+
+class DeferredReply:
+    """Result of a request queued inside GoogleDocsAdvancedToolkit.batch()
+    
+    value is filled in from the matching batchUpdate reply once the batch
+    is flushed. follow_up, when set, turns that value into requests that
+    must run after it (e.g. text for a newly created header).
+    """
+    
+    def __init__(self, index: int, extract, follow_up=None):
+        self.index = index
+        self.extract = extract
+        self.follow_up = follow_up
+        self.value = None
+
+
+def _request_index(request: Dict) -> Optional[float]:
+    """Document index a batchUpdate request acts at, for batch(sort_by_index=True)
+    
+    Appends at the end of a segment sort first; None means the request has
+    no single position (document style, replaceAllText, ...).
+    """
+    body = next(iter(request.values()))
+    if 'location' in body:
+        return body['location']['index']
+    if 'range' in body:
+        return body['range']['startIndex']
+    if 'tableCellLocation' in body:
+        return body['tableCellLocation']['tableStartLocation']['index']
+    if 'tableStartLocation' in body:
+        return body['tableStartLocation']['index']
+    if 'tableRange' in body:
+        return body['tableRange']['tableCellLocation']['tableStartLocation']['index']
+    if 'endOfSegmentLocation' in body:
+        return float('inf')
+    return None
+
+
+# Style updates that coalesce_style_updates may merge, with their style key
+_MERGEABLE_STYLE_UPDATES = {
+    'updateTextStyle': 'textStyle',
+    'updateParagraphStyle': 'paragraphStyle',
+}
+
+
+def coalesce_style_updates(requests: List[Dict],
+                           deferred: Iterable[DeferredReply] = ()) -> List[Dict]:
+    """Merge back-to-back style updates that apply the same style to
+    touching or overlapping ranges into one update over their union
+    
+    Only neighbours in the list are merged, so nothing that runs between
+    them can move their indexes. Rendered styles come from the render
+    caches, so identical styles are usually the same dict object.
+    Indexes of deferred replies are remapped to the shortened list.
+    """
+    merged = []
+    new_positions = []
+    prev_op = prev_body = None
+    for request in requests:
+        op = next(iter(request))
+        body = request[op]
+        style_key = _MERGEABLE_STYLE_UPDATES.get(op)
+        if style_key and op == prev_op:
+            prev_range, this_range = prev_body['range'], body['range']
+            prev_style, this_style = prev_body[style_key], body[style_key]
+            if (prev_range['startIndex'] <= this_range['startIndex'] <= prev_range['endIndex']
+                    and prev_range.get('segmentId') == this_range.get('segmentId')
+                    and prev_range.get('tabId') == this_range.get('tabId')
+                    and prev_body['fields'] == body['fields']
+                    and (prev_style is this_style or prev_style == this_style)):
+                prev_body['range'] = dict(
+                    prev_range, endIndex=max(prev_range['endIndex'], this_range['endIndex'])
+                )
+                new_positions.append(len(merged) - 1)
+                continue
+        
+        if style_key:
+            # Copy the outer layers so merging never edits the caller's request
+            body = dict(body)
+            request = {op: body}
+        merged.append(request)
+        new_positions.append(len(merged) - 1)
+        prev_op, prev_body = op, body
+    
+    for reply in deferred:
+        reply.index = new_positions[reply.index]
+    return merged
+
+
+@dataclass
+class Block:
+    """One piece of content for GoogleDocsAdvancedToolkit.append_section
+    
+    payload by kind:
+        paragraph   text, and optionally style (TextStyle),
+                    named_style, paragraph_style (ParagraphStyle)
+        page_break  (none)
+        table       rows, columns, and optionally table_style (TableStyle)
+        image       image_url, and optionally width, height
+    """
+    kind: BlockKindT
+    payload: Dict = field(default_factory=dict)
 
 
 # ============================================================================
 # MAIN TOOLKIT CLASS
 # ============================================================================
 
+def _thread_local(name: str, default: Any = None) -> property:
+    """Instance attribute kept on self._local, so each thread sees its own"""
+    def get(self):
+        return getattr(self._local, name, default)
+    
+    def set(self, value):
+        setattr(self._local, name, value)
+    
+    return property(get, set)
+
+
 class GoogleDocsAdvancedToolkit:
     """Comprehensive Google Docs API toolkit with all features"""
     
-    def __init__(self, key_file='service-account-key.json'):
+    # Requests queued by batch(); None when not batching. Worker threads
+    # (bulk helpers, AsyncGoogleDocsToolkit) never see another thread's
+    # batch, so their calls are sent rather than queued into it.
+    _batch_doc_id = _thread_local('batch_doc_id')
+    _batch_requests = _thread_local('batch_requests')
+    _batch_deferred = _thread_local('batch_deferred')
+    # Offset of each queueing call's first request, for sort_by_index
+    _batch_groups = _thread_local('batch_groups')
+    _batch_sort = _thread_local('batch_sort', False)
+    
+    def __init__(self, key_file='service-account-key.json',
+                 http_cache_dir: Optional[str] = None,
+                 read_cache_ttl: float = READ_CACHE_TTL):
         self.key_file = key_file
+        self.http_cache_dir = http_cache_dir
+        self.read_cache_ttl = read_cache_ttl
+        # (doc_id, kind) -> (fetched at, response), oldest first
+        self._read_cache = OrderedDict()
+        self._read_cache_lock = threading.Lock()
+        # (doc_id, limit) -> (Drive file version, revisions) for get_revision_history
+        self._revision_history = {}
+        # (doc_id, fields) -> (revisionId, document), oldest first
+        self._document_cache = OrderedDict()
+        # doc_id -> (document it was built from, index) for get_named_ranges_by_name
+        self._named_range_index = {}
         self.service = None
-        self.docs_service = None
-        self.drive_service = None
+        self.credentials = None
+        # Discovery clients sit on httplib2, which is not thread-safe, so
+        # each thread gets its own pair (see docs_service/drive_service),
+        # along with its own batch() state
+        self._local = threading.local()
+        # Worker pool shared by the bulk helpers and AsyncGoogleDocsToolkit,
+        # created on first use; its threads keep their clients between calls
+        self._executor = None
+        self._executor_lock = threading.Lock()
         self._authenticate()
         
     def _authenticate(self):
@@ -125,10 +799,50 @@ class GoogleDocsAdvancedToolkit:
         credentials = service_account.Credentials.from_service_account_file(
             self.key_file, scopes=SCOPES
         )
+        self.credentials = credentials
+        
+        # Build the calling thread's clients up front
+        self.docs_service
+        self.drive_service
         
-        self.docs_service = build('docs', 'v1', credentials=credentials)
-        self.drive_service = build('drive', 'v3', credentials=credentials)
-        print("✓ Authenticated with Google Docs and Drive APIs")
+        # Thread-safe pooled session for fanning out across many documents;
+        # kept-alive connections skip the TCP/TLS handshake on each call
+        self.session = AuthorizedSession(credentials)
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=2, pool_maxsize=MAX_CONCURRENT_REQUESTS,
+            max_retries=SESSION_RETRY
+        ))
+        logger.debug("✓ Authenticated with Google Docs and Drive APIs")
+    
+    @property
+    def docs_service(self):
+        """Docs API client for the calling thread"""
+        service = getattr(self._local, 'docs_service', None)
+        if service is None:
+            if self.http_cache_dir:
+                # httplib2 keeps ETags and revalidates cached GETs; only the
+                # Docs client uses it so Drive exports are not copied into it.
+                # build_http() supplies the client library's default timeout.
+                cache_dir = os.path.expanduser(self.http_cache_dir)
+                _prune_http_cache(cache_dir, HTTP_CACHE_MAX_BYTES)
+                base_http = build_http()
+                base_http.cache = httplib2.FileCache(cache_dir)
+                http = google_auth_httplib2.AuthorizedHttp(self.credentials, http=base_http)
+                service = build('docs', 'v1', http=http, model=CompactJsonModel())
+            else:
+                service = build('docs', 'v1', credentials=self.credentials,
+                                model=CompactJsonModel())
+            self._local.docs_service = service
+        return service
+    
+    @property
+    def drive_service(self):
+        """Drive API client for the calling thread"""
+        service = getattr(self._local, 'drive_service', None)
+        if service is None:
+            service = build('drive', 'v3', credentials=self.credentials)
+            self._local.drive_service = service
+        return service
     
     # ========================================================================
     # DOCUMENT MANAGEMENT
@@ -139,14 +853,14 @@ class GoogleDocsAdvancedToolkit:
         try:
             document = self.docs_service.documents().create(
                 body={'title': title}
-            ).execute()
+            ).execute(num_retries=MAX_RETRIES)
             
             doc_id = document.get('documentId')
-            print(f"✓ Created new document: {title} (ID: {doc_id})")
+            logger.debug("✓ Created new document: %s (ID: %s)", title, doc_id)
             return doc_id
             
         except HttpError as e:
-            print(f"✗ Error creating document: {e}")
+            logger.error("✗ Error creating document: %s", e)
             return None
     
     def copy_document(self, doc_id: str, new_title: str) -> str:
@@ -155,46 +869,173 @@ class GoogleDocsAdvancedToolkit:
             copy = self.drive_service.files().copy(
                 fileId=doc_id,
                 body={'name': new_title}
-            ).execute()
+            ).execute(num_retries=MAX_RETRIES)
             
             new_id = copy.get('id')
-            print(f"✓ Created copy: {new_title} (ID: {new_id})")
+            logger.debug("✓ Created copy: %s (ID: %s)", new_title, new_id)
             return new_id
             
         except HttpError as e:
-            print(f"✗ Error copying document: {e}")
+            logger.error("✗ Error copying document: %s", e)
             return None
     
     def get_document_metadata(self, doc_id: str) -> Dict:
-        """Get comprehensive document metadata"""
+        """Get comprehensive document metadata
+        
+        The document body is not fetched; use documents().get() directly
+        when the content itself is needed.
+        """
         try:
-            doc = self.docs_service.documents().get(
+            doc = self._cached_read(doc_id, 'metadata', lambda: self.docs_service.documents().get(
                 documentId=doc_id,
-                fields='*'  # Get all fields
-            ).execute()
+                fields=METADATA_FIELDS
+            ).execute(num_retries=MAX_RETRIES))
             
-            metadata = {
-                'title': doc.get('title'),
-                'documentId': doc.get('documentId'),
-                'revisionId': doc.get('revisionId'),
-                'suggestionsViewMode': doc.get('suggestionsViewMode'),
-                'documentStyle': doc.get('documentStyle'),
-                'namedStyles': doc.get('namedStyles'),
-                'lists': doc.get('lists'),
-                'namedRanges': doc.get('namedRanges'),
-                'positionedObjects': doc.get('positionedObjects'),
-                'inlineObjects': doc.get('inlineObjects'),
-                'footnotes': doc.get('footnotes'),
-                'headers': doc.get('headers'),
-                'footers': doc.get('footers')
-            }
-            
-            return metadata
+            return _metadata_from(doc)
             
         except HttpError as e:
-            print(f"✗ Error getting metadata: {e}")
+            logger.error("✗ Error getting metadata: %s", e)
             return {}
     
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """The toolkit's shared worker pool of MAX_CONCURRENT_REQUESTS threads"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS)
+            return self._executor
+    
+    def close(self):
+        """Shut down the shared worker pool, if it was started"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+    
+    def _map_concurrently(self, func, items: List, max_workers: int) -> List:
+        """Run func over items on the shared pool, keeping the input order
+        
+        At most max_workers calls (and never more than the pool's threads)
+        are in flight at once.
+        """
+        executor = self._get_executor()
+        results = []
+        pending = deque()
+        for item in items:
+            if len(pending) >= max_workers:
+                results.append(pending.popleft().result())
+            pending.append(executor.submit(func, item))
+        results.extend(future.result() for future in pending)
+        return results
+    
+    def bulk_create_documents(self, titles: List[str],
+                              max_workers: int = MAX_CONCURRENT_REQUESTS) -> Dict[str, str]:
+        """Create several documents concurrently; returns title -> document ID"""
+        return dict(zip(titles, self._map_concurrently(self.create_document, titles, max_workers)))
+    
+    def bulk_copy_documents(self, copies: Dict[str, str],
+                            max_workers: int = MAX_CONCURRENT_REQUESTS) -> Dict[str, str]:
+        """Copy several documents concurrently
+        
+        copies maps source document ID -> new title; returns source ID -> copy ID.
+        """
+        new_ids = self._map_concurrently(
+            lambda doc_id: self.copy_document(doc_id, copies[doc_id]), list(copies), max_workers
+        )
+        return dict(zip(copies, new_ids))
+    
+    def bulk_get_metadata(self, doc_ids: List[str],
+                          max_workers: int = MAX_CONCURRENT_REQUESTS) -> Dict[str, Dict]:
+        """Fetch metadata for several documents concurrently"""
+        return dict(zip(doc_ids, self._map_concurrently(self.get_document_metadata, doc_ids, max_workers)))
+    
+    def bulk_get_named_ranges(self, doc_ids: List[str],
+                              max_workers: int = MAX_CONCURRENT_REQUESTS) -> Dict[str, List[Dict]]:
+        """Fetch the named ranges of several documents concurrently"""
+        return dict(zip(doc_ids, self._map_concurrently(self.get_all_named_ranges, doc_ids, max_workers)))
+    
+    def bulk_export_as_pdf(self, doc_ids: List[str], output_dir: str,
+                           max_workers: int = MAX_CONCURRENT_REQUESTS) -> Dict[str, bool]:
+        """Export several documents concurrently to output_dir/<doc_id>.pdf
+        
+        Exports stream straight to disk, so the work is network-bound and
+        threads overlap it as well as processes would, without re-creating
+        credentials and clients in each worker.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        return dict(zip(doc_ids, self._map_concurrently(
+            lambda doc_id: self.export_as_pdf(doc_id, os.path.join(output_dir, f'{doc_id}.pdf')),
+            doc_ids, max_workers
+        )))
+    
+    def _execute_http_batch(self, service, calls: Dict[str, Any]) -> Dict[str, Any]:
+        """Send calls (key -> HttpRequest) as multipart batch requests
+        
+        Returns key -> response, or key -> HttpError for calls that failed.
+        The service's own batch endpoint is used, so Docs and Drive calls
+        must go in separate batches.
+        """
+        results = {}
+        
+        def collect(request_id, response, exception):
+            results[request_id] = response if exception is None else exception
+        
+        keys = list(calls)
+        for start in range(0, len(keys), MAX_BATCH_HTTP_REQUESTS):
+            batch = service.new_batch_http_request(callback=collect)
+            for key in keys[start:start + MAX_BATCH_HTTP_REQUESTS]:
+                batch.add(calls[key], request_id=key)
+            batch.execute()
+        
+        return results
+    
+    def bulk_get_metadata_batched(self, doc_ids: List[str]) -> Dict[str, Dict]:
+        """Fetch metadata for several documents in one multipart request"""
+        documents = self.docs_service.documents()
+        try:
+            responses = self._execute_http_batch(self.docs_service, {
+                doc_id: documents.get(documentId=doc_id, fields=METADATA_FIELDS)
+                for doc_id in doc_ids
+            })
+        except HttpError as e:
+            logger.error("✗ Error getting metadata: %s", e)
+            return {doc_id: {} for doc_id in doc_ids}
+        
+        metadata = {}
+        for doc_id in doc_ids:
+            response = responses.get(doc_id)
+            if isinstance(response, dict):
+                metadata[doc_id] = _metadata_from(response)
+            else:
+                logger.error("✗ Error getting metadata for %s: %s", doc_id, response)
+                metadata[doc_id] = {}
+        return metadata
+    
+    def bulk_copy_documents_batched(self, copies: Dict[str, str]) -> Dict[str, str]:
+        """Copy several documents in one multipart Drive request
+        
+        copies maps source document ID -> new title; returns source ID -> copy ID.
+        """
+        files = self.drive_service.files()
+        try:
+            responses = self._execute_http_batch(self.drive_service, {
+                doc_id: files.copy(fileId=doc_id, body={'name': title})
+                for doc_id, title in copies.items()
+            })
+        except HttpError as e:
+            logger.error("✗ Error copying documents: %s", e)
+            return {doc_id: None for doc_id in copies}
+        
+        new_ids = {}
+        for doc_id, title in copies.items():
+            response = responses.get(doc_id)
+            if isinstance(response, dict):
+                new_ids[doc_id] = response.get('id')
+                logger.debug("✓ Created copy: %s (ID: %s)", title, new_ids[doc_id])
+            else:
+                logger.error("✗ Error copying document %s: %s", doc_id, response)
+                new_ids[doc_id] = None
+        return new_ids
+    
     # ========================================================================
     # TEXT OPERATIONS
     # ========================================================================
@@ -214,73 +1055,7 @@ class GoogleDocsAdvancedToolkit:
         
         # Apply styling if provided
         if style:
-            text_style = {}
-            fields = []
-            
-            if style.bold is not None:
-                text_style['bold'] = style.bold
-                fields.append('bold')
-                
-            if style.italic is not None:
-                text_style['italic'] = style.italic
-                fields.append('italic')
-                
-            if style.underline is not None:
-                text_style['underline'] = style.underline
-                fields.append('underline')
-                
-            if style.strikethrough is not None:
-                text_style['strikethrough'] = style.strikethrough
-                fields.append('strikethrough')
-                
-            if style.small_caps is not None:
-                text_style['smallCaps'] = style.small_caps
-                fields.append('smallCaps')
-                
-            if style.font_family:
-                text_style['weightedFontFamily'] = {
-                    'fontFamily': style.font_family
-                }
-                fields.append('weightedFontFamily')
-                
-            if style.font_size:
-                text_style['fontSize'] = {
-                    'magnitude': style.font_size,
-                    'unit': 'PT'
-                }
-                fields.append('fontSize')
-                
-            if style.foreground_color:
-                text_style['foregroundColor'] = {
-                    'color': {
-                        'rgbColor': {
-                            'red': style.foreground_color[0],
-                            'green': style.foreground_color[1],
-                            'blue': style.foreground_color[2]
-                        }
-                    }
-                }
-                fields.append('foregroundColor')
-                
-            if style.background_color:
-                text_style['backgroundColor'] = {
-                    'color': {
-                        'rgbColor': {
-                            'red': style.background_color[0],
-                            'green': style.background_color[1],
-                            'blue': style.background_color[2]
-                        }
-                    }
-                }
-                fields.append('backgroundColor')
-                
-            if style.link_url:
-                text_style['link'] = {'url': style.link_url}
-                fields.append('link')
-                
-            if style.baseline_offset:
-                text_style['baselineOffset'] = style.baseline_offset
-                fields.append('baselineOffset')
+            text_style, fields = render_text_style(style)
             
             if fields:
                 requests.append({
@@ -290,7 +1065,7 @@ class GoogleDocsAdvancedToolkit:
                             'endIndex': index + len(text)
                         },
                         'textStyle': text_style,
-                        'fields': ','.join(fields)
+                        'fields': fields
                     }
                 })
         
@@ -309,18 +1084,23 @@ class GoogleDocsAdvancedToolkit:
             }
         }]
         
+        deferred = self._queue_for_reply(doc_id, requests[0], _named_range_id)
+        if deferred:
+            return deferred
+        
         try:
+            self._invalidate_reads(doc_id)
             result = self.docs_service.documents().batchUpdate(
                 documentId=doc_id,
                 body={'requests': requests}
-            ).execute()
+            ).execute(num_retries=MAX_RETRIES)
             
             range_id = result['replies'][0]['createNamedRange']['namedRangeId']
-            print(f"✓ Created named range '{name}' (ID: {range_id})")
+            logger.debug("✓ Created named range '%s' (ID: %s)", name, range_id)
             return range_id
             
         except HttpError as e:
-            print(f"✗ Error creating named range: {e}")
+            logger.error("✗ Error creating named range: %s", e)
             return None
     
     # ========================================================================
@@ -330,70 +1110,11 @@ class GoogleDocsAdvancedToolkit:
     def format_paragraph(self, doc_id: str, start_index: int, end_index: int,
                         style: ParagraphStyle) -> bool:
         """Apply comprehensive paragraph formatting"""
-        paragraph_style = {}
-        fields = []
-        
-        if style.alignment:
-            paragraph_style['alignment'] = style.alignment.value
-            fields.append('alignment')
-            
-        if style.line_spacing is not None:
-            paragraph_style['lineSpacing'] = style.line_spacing
-            fields.append('lineSpacing')
-            
-        if style.space_above is not None:
-            paragraph_style['spaceAbove'] = {
-                'magnitude': style.space_above,
-                'unit': 'PT'
-            }
-            fields.append('spaceAbove')
-            
-        if style.space_below is not None:
-            paragraph_style['spaceBelow'] = {
-                'magnitude': style.space_below,
-                'unit': 'PT'
-            }
-            fields.append('spaceBelow')
-            
-        if style.indent_first_line is not None:
-            paragraph_style['indentFirstLine'] = {
-                'magnitude': style.indent_first_line,
-                'unit': 'PT'
-            }
-            fields.append('indentFirstLine')
-            
-        if style.indent_start is not None:
-            paragraph_style['indentStart'] = {
-                'magnitude': style.indent_start,
-                'unit': 'PT'
-            }
-            fields.append('indentStart')
-            
-        if style.indent_end is not None:
-            paragraph_style['indentEnd'] = {
-                'magnitude': style.indent_end,
-                'unit': 'PT'
-            }
-            fields.append('indentEnd')
-            
-        if style.keep_lines_together is not None:
-            paragraph_style['keepLinesTogether'] = style.keep_lines_together
-            fields.append('keepLinesTogether')
-            
-        if style.keep_with_next is not None:
-            paragraph_style['keepWithNext'] = style.keep_with_next
-            fields.append('keepWithNext')
-            
-        if style.avoid_widow_and_orphan is not None:
-            paragraph_style['avoidWidowAndOrphan'] = style.avoid_widow_and_orphan
-            fields.append('avoidWidowAndOrphan')
+        if style.alignment and style.alignment not in VALID_ALIGNMENTS:
+            logger.error("✗ Unknown paragraph alignment: %s", style.alignment)
+            return False
         
-        # Add borders if specified
-        for border in ['borderTop', 'borderBottom', 'borderLeft', 'borderRight']:
-            border_value = getattr(style, border.lower().replace('border', 'border_'))
-            if border_value:
-                paragraph_style[border] = border_value
-                fields.append(border)
+        paragraph_style, fields = render_paragraph_style(style)
         
         requests = [{
             'updateParagraphStyle': {
@@ -402,15 +1123,19 @@ class GoogleDocsAdvancedToolkit:
                     'endIndex': end_index
                 },
                 'paragraphStyle': paragraph_style,
-                'fields': ','.join(fields)
+                'fields': fields
             }
         }]
         
         return self._execute_batch_update(doc_id, requests)
     
     def apply_named_style(self, doc_id: str, start_index: int, end_index: int,
-                         style_type: NamedStyleType) -> bool:
+                         style_type: NamedStyleT) -> bool:
         """Apply a predefined named style to a range"""
+        if style_type not in VALID_NAMED_STYLES:
+            logger.error("✗ Unknown named style: %s", style_type)
+            return False
+        
         requests = [{
             'updateParagraphStyle': {
                 'range': {
@@ -418,7 +1143,7 @@ class GoogleDocsAdvancedToolkit:
                     'endIndex': end_index
                 },
                 'paragraphStyle': {
-                    'namedStyleType': style_type.value
+                    'namedStyleType': style_type
                 },
                 'fields': 'namedStyleType'
             }
@@ -431,16 +1156,20 @@ class GoogleDocsAdvancedToolkit:
     # ========================================================================
     
     def create_list(self, doc_id: str, start_index: int, end_index: int,
-                   glyph_type: ListGlyphType = ListGlyphType.BULLET,
+                   glyph_type: GlyphT = GLYPH_BULLET,
                    nesting_level: int = 0) -> bool:
         """Create a list with specified style"""
+        if glyph_type not in VALID_GLYPH_TYPES:
+            logger.error("✗ Unknown list glyph type: %s", glyph_type)
+            return False
+        
         requests = [{
             'createParagraphBullets': {
                 'range': {
                     'startIndex': start_index,
                     'endIndex': end_index
                 },
-                'bulletPreset': glyph_type.value
+                'bulletPreset': glyph_type
             }
         }]
         
@@ -494,7 +1223,7 @@ class GoogleDocsAdvancedToolkit:
         
         if table_style and table_style.table_column_properties:
             table_request['insertTable']['tableColumnProperties'] = \
-                table_style.table_column_properties
+                table_style.column_properties()
         
         requests = [table_request]
         
@@ -566,7 +1295,22 @@ class GoogleDocsAdvancedToolkit:
                                row_index: int, column_index: int,
                                background_color: Optional[Tuple[float, float, float]] = None,
                                border_style: Optional[Dict] = None) -> bool:
-        """Update table cell styling"""
+        """Update table cell styling
+        
+        To style a band of cells, use update_table_cell_range_style, which
+        sends one request for the whole band instead of one per cell.
+        """
+        return self.update_table_cell_range_style(
+            doc_id, table_start_index, row_index, row_index, column_index, column_index,
+            background_color, border_style
+        )
+    
+    def update_table_cell_range_style(self, doc_id: str, table_start_index: int,
+                                      row_start: int, row_end: int,
+                                      col_start: int, col_end: int,
+                                      background_color: Optional[Tuple[float, float, float]] = None,
+                                      border_style: Optional[Dict] = None) -> bool:
+        """Style a rectangle of table cells (inclusive bounds) in one request"""
         style = {}
         fields = []
         
@@ -583,17 +1327,21 @@ class GoogleDocsAdvancedToolkit:
             fields.append('backgroundColor')
         
         if border_style:
-            for border in ['borderTop', 'borderBottom', 'borderLeft', 'borderRight']:
+            for border in ('borderTop', 'borderBottom', 'borderLeft', 'borderRight'):
                 if border in border_style:
                     style[border] = border_style[border]
                     fields.append(border)
         
         requests = [{
             'updateTableCellStyle': {
-                'tableCellLocation': {
-                    'tableStartLocation': {'index': table_start_index},
-                    'rowIndex': row_index,
-                    'columnIndex': column_index
+                'tableRange': {
+                    'tableCellLocation': {
+                        'tableStartLocation': {'index': table_start_index},
+                        'rowIndex': row_start,
+                        'columnIndex': col_start
+                    },
+                    'rowSpan': row_end - row_start + 1,
+                    'columnSpan': col_end - col_start + 1
                 },
                 'tableCellStyle': style,
                 'fields': ','.join(fields)
@@ -644,12 +1392,16 @@ class GoogleDocsAdvancedToolkit:
         return self._execute_batch_update(doc_id, requests)
     
     def insert_section_break(self, doc_id: str, index: int,
-                           section_type: SectionType = SectionType.NEXT_PAGE) -> bool:
+                           section_type: SectionT = SECTION_NEXT_PAGE) -> bool:
         """Insert a section break"""
+        if section_type not in VALID_SECTION_TYPES:
+            logger.error("✗ Unknown section type: %s", section_type)
+            return False
+        
         requests = [{
             'insertSectionBreak': {
                 'location': {'index': index},
-                'sectionType': section_type.value
+                'sectionType': section_type
             }
         }]
         
@@ -657,40 +1409,18 @@ class GoogleDocsAdvancedToolkit:
     
     def insert_footnote(self, doc_id: str, index: int, footnote_text: str) -> bool:
         """Insert a footnote"""
-        requests = [
-            {
-                'createFootnote': {
-                    'location': {'index': index}
-                }
-            }
-        ]
-        
-        # Execute the create footnote request first
-        try:
-            result = self.docs_service.documents().batchUpdate(
-                documentId=doc_id,
-                body={'requests': requests}
-            ).execute()
-            
-            # Get the footnote ID from the response
-            footnote_id = result['replies'][0]['createFootnote']['footnoteId']
-            
-            # Now insert text into the footnote
-            footnote_requests = [{
+        return self._create_segment(
+            doc_id,
+            {'createFootnote': {'location': {'index': index}}},
+            lambda reply: reply['createFootnote']['footnoteId'],
+            lambda footnote_id: [{
                 'insertText': {
-                    'location': {
-                        'segmentId': footnote_id,
-                        'index': 1  # Footnotes start at index 1
-                    },
+                    # Footnotes start at index 1
+                    'location': {'segmentId': footnote_id, 'index': 1},
                     'text': footnote_text
                 }
             }]
-            
-            return self._execute_batch_update(doc_id, footnote_requests)
-            
-        except HttpError as e:
-            print(f"✗ Error inserting footnote: {e}")
-            return False
+        )
     
     # ========================================================================
     # HEADER AND FOOTER OPERATIONS
@@ -699,78 +1429,42 @@ class GoogleDocsAdvancedToolkit:
     def create_header(self, doc_id: str, header_text: str,
                      section_index: int = 0) -> bool:
         """Create a header for the document or section"""
-        requests = [
+        return self._create_segment(
+            doc_id,
             {
                 'createHeader': {
                     'type': 'DEFAULT',
                     'sectionBreakLocation': {'index': section_index}
                 }
-            }
-        ]
-        
-        try:
-            result = self.docs_service.documents().batchUpdate(
-                documentId=doc_id,
-                body={'requests': requests}
-            ).execute()
-            
-            # Get header ID
-            header_id = result['replies'][0]['createHeader']['headerId']
-            
-            # Insert text into header
-            header_requests = [{
+            },
+            lambda reply: reply['createHeader']['headerId'],
+            lambda header_id: [{
                 'insertText': {
-                    'location': {
-                        'segmentId': header_id,
-                        'index': 0
-                    },
+                    'location': {'segmentId': header_id, 'index': 0},
                     'text': header_text
                 }
             }]
-            
-            return self._execute_batch_update(doc_id, header_requests)
-            
-        except HttpError as e:
-            print(f"✗ Error creating header: {e}")
-            return False
+        )
     
     def create_footer(self, doc_id: str, footer_text: str,
                      section_index: int = 0) -> bool:
         """Create a footer for the document or section"""
-        requests = [
+        return self._create_segment(
+            doc_id,
             {
                 'createFooter': {
                     'type': 'DEFAULT',
                     'sectionBreakLocation': {'index': section_index}
                 }
-            }
-        ]
-        
-        try:
-            result = self.docs_service.documents().batchUpdate(
-                documentId=doc_id,
-                body={'requests': requests}
-            ).execute()
-            
-            # Get footer ID
-            footer_id = result['replies'][0]['createFooter']['footerId']
-            
-            # Insert text into footer
-            footer_requests = [{
+            },
+            lambda reply: reply['createFooter']['footerId'],
+            lambda footer_id: [{
                 'insertText': {
-                    'location': {
-                        'segmentId': footer_id,
-                        'index': 0
-                    },
+                    'location': {'segmentId': footer_id, 'index': 0},
                     'text': footer_text
                 }
             }]
-            
-            return self._execute_batch_update(doc_id, footer_requests)
-            
-        except HttpError as e:
-            print(f"✗ Error creating footer: {e}")
-            return False
+        )
     
     # ========================================================================
     # DOCUMENT STYLE OPERATIONS
@@ -784,37 +1478,18 @@ class GoogleDocsAdvancedToolkit:
                             page_size: Optional[Dict] = None,
                             use_custom_header_footer_margins: Optional[bool] = None) -> bool:
         """Update overall document styling"""
-        document_style = {}
-        fields = []
-        
-        if margin_top is not None:
-            document_style['marginTop'] = {'magnitude': margin_top, 'unit': 'PT'}
-            fields.append('marginTop')
-            
-        if margin_bottom is not None:
-            document_style['marginBottom'] = {'magnitude': margin_bottom, 'unit': 'PT'}
-            fields.append('marginBottom')
-            
-        if margin_left is not None:
-            document_style['marginLeft'] = {'magnitude': margin_left, 'unit': 'PT'}
-            fields.append('marginLeft')
-            
-        if margin_right is not None:
-            document_style['marginRight'] = {'magnitude': margin_right, 'unit': 'PT'}
-            fields.append('marginRight')
-            
-        if page_size:
-            document_style['pageSize'] = page_size
-            fields.append('pageSize')
-            
-        if use_custom_header_footer_margins is not None:
-            document_style['useCustomHeaderFooterMargins'] = use_custom_header_footer_margins
-            fields.append('useCustomHeaderFooterMargins')
+        values = (margin_top, margin_bottom, margin_left, margin_right,
+                  page_size or None, use_custom_header_footer_margins)
+        document_style = {
+            api_name: convert(value)
+            for (api_name, convert), value in zip(_DOCUMENT_STYLE_SPEC, values)
+            if value is not None
+        }
         
         requests = [{
             'updateDocumentStyle': {
                 'documentStyle': document_style,
-                'fields': ','.join(fields)
+                'fields': ','.join(document_style)
             }
         }]
         
@@ -824,6 +1499,64 @@ class GoogleDocsAdvancedToolkit:
     # ADVANCED OPERATIONS
     # ========================================================================
     
+    def append_section(self, doc_id: str, index: int, blocks: List[Block]) -> Optional[int]:
+        """Insert blocks one after another from index in a single batchUpdate
+        
+        Returns the index just past the section, ready for the next one,
+        or None if a block was invalid or the update failed. Inside batch()
+        for doc_id the requests join that batch instead; a batch open for
+        another document is left as it is.
+        """
+        if self._batch_requests is not None and doc_id == self._batch_doc_id:
+            return self._queue_blocks(doc_id, index, blocks)
+        
+        with self.batch(doc_id):
+            end_index = self._queue_blocks(doc_id, index, blocks)
+            if end_index is None or not self.flush():
+                return None
+            return end_index
+    
+    def _queue_blocks(self, doc_id: str, index: int, blocks: List[Block]) -> Optional[int]:
+        """Queue the requests for blocks, tracking the running index"""
+        mark = (len(self._batch_requests), len(self._batch_groups))
+        
+        for block in blocks:
+            payload = block.payload
+            if block.kind == BLOCK_PARAGRAPH:
+                text = payload['text']
+                end = index + len(text)
+                ok = self.insert_text_with_style(doc_id, text, index, payload.get('style'))
+                if ok and payload.get('named_style'):
+                    ok = self.apply_named_style(doc_id, index, end, payload['named_style'])
+                if ok and payload.get('paragraph_style'):
+                    ok = self.format_paragraph(doc_id, index, end, payload['paragraph_style'])
+            elif block.kind == BLOCK_PAGE_BREAK:
+                # The break is followed by a newline
+                end = index + 2
+                ok = self.insert_page_break(doc_id, index)
+            elif block.kind == BLOCK_TABLE:
+                # A newline goes in before the table; then one index for the
+                # table, one per row, and a cell plus its empty paragraph each
+                rows, columns = payload['rows'], payload['columns']
+                end = index + 2 + rows * (1 + 2 * columns)
+                ok = self.insert_table(doc_id, index, rows, columns, payload.get('table_style'))
+            elif block.kind == BLOCK_IMAGE:
+                end = index + 1
+                ok = self.insert_image(doc_id, index, payload['image_url'],
+                                       payload.get('width'), payload.get('height'))
+            else:
+                logger.error("✗ Unknown block kind: %s", block.kind)
+                ok = False
+            
+            if not ok:
+                # Drop this section's requests so a bad block sends nothing
+                del self._batch_requests[mark[0]:]
+                del self._batch_groups[mark[1]:]
+                return None
+            index = end
+        
+        return index
+    
     def merge_table_cells(self, doc_id: str, table_start_index: int,
                          row_start: int, row_end: int,
                          column_start: int, column_end: int) -> bool:
@@ -875,89 +1608,83 @@ class GoogleDocsAdvancedToolkit:
             }
         }]
         
+        deferred = self._queue_for_reply(doc_id, requests[0], _named_range_id)
+        if deferred:
+            return deferred
+        
         try:
+            self._invalidate_reads(doc_id)
             result = self.docs_service.documents().batchUpdate(
                 documentId=doc_id,
                 body={'requests': requests}
-            ).execute()
+            ).execute(num_retries=MAX_RETRIES)
             
             bookmark_id = result['replies'][0]['createNamedRange']['namedRangeId']
-            print(f"✓ Created bookmark (ID: {bookmark_id})")
+            logger.debug("✓ Created bookmark (ID: %s)", bookmark_id)
             return bookmark_id
             
         except HttpError as e:
-            print(f"✗ Error creating bookmark: {e}")
+            logger.error("✗ Error creating bookmark: %s", e)
             return None
     
     def get_all_named_ranges(self, doc_id: str) -> List[Dict]:
         """Get all named ranges (including bookmarks) in the document"""
+        return [
+            named_range
+            for named_ranges in self.get_named_ranges_by_name(doc_id).values()
+            for named_range in named_ranges
+        ]
+    
+    def get_named_ranges_by_name(self, doc_id: str) -> Dict[str, List[Dict]]:
+        """Get the document's named ranges grouped by name, for direct lookup
+        
+        Each entry has the same shape as in get_all_named_ranges. The
+        ranges come from _get_document, so a repeat call costs only a
+        revisionId check, and the index is rebuilt only when the document
+        has changed. The result is shared and must not be mutated.
+        """
         try:
-            document = self.docs_service.documents().get(
-                documentId=doc_id,
-                fields='namedRanges'
-            ).execute()
-            
-            named_ranges = []
-            for name, ranges in document.get('namedRanges', {}).items():
-                for range_data in ranges.get('namedRanges', []):
-                    named_ranges.append({
-                        'name': name,
-                        'id': range_data.get('namedRangeId'),
-                        'ranges': range_data.get('ranges', [])
-                    })
+            document = self._get_document(doc_id, 'namedRanges')
+            entry = self._named_range_index.get(doc_id)
+            if entry and entry[0] is document:
+                return entry[1]
             
-            return named_ranges
+            index = self._index_named_ranges(document)
+            self._named_range_index[doc_id] = (document, index)
+            return index
             
         except HttpError as e:
-            print(f"✗ Error getting named ranges: {e}")
-            return []
+            logger.error("✗ Error getting named ranges: %s", e)
+            return {}
+    
+    @staticmethod
+    def _index_named_ranges(document: Dict) -> Dict[str, List[Dict]]:
+        return {
+            name: [
+                {
+                    'name': name,
+                    'id': range_data.get('namedRangeId'),
+                    'ranges': range_data.get('ranges', [])
+                }
+                for range_data in ranges.get('namedRanges', [])
+            ]
+            for name, ranges in document.get('namedRanges', {}).items()
+        }
     
     def replace_named_range_content(self, doc_id: str, range_name: str,
                                    new_content: str) -> bool:
-        """Replace content in a named range"""
-        # First get the named range
-        named_ranges = self.get_all_named_ranges(doc_id)
-        target_range = None
-        
-        for nr in named_ranges:
-            if nr['name'] == range_name:
-                target_range = nr
-                break
-        
-        if not target_range:
-            print(f"✗ Named range '{range_name}' not found")
-            return False
-        
-        # Get the range bounds
-        ranges = target_range['ranges']
-        if not ranges:
-            print(f"✗ Named range '{range_name}' has no ranges")
-            return False
+        """Replace content in a named range
         
-        # Delete existing content and insert new
-        requests = []
-        for r in ranges:
-            start = r.get('startIndex', 0)
-            end = r.get('endIndex', 0)
-            
-            # Delete existing content
-            if end > start:
-                requests.append({
-                    'deleteContentRange': {
-                        'range': {
-                            'startIndex': start,
-                            'endIndex': end
-                        }
-                    }
-                })
-            
-            # Insert new content
-            requests.append({
-                'insertText': {
-                    'location': {'index': start},
-                    'text': new_content
-                }
-            })
+        The server resolves the range, so no read of the document is needed
+        and the named range still covers the new content afterwards. Every
+        range carrying range_name is replaced.
+        """
+        requests = [{
+            'replaceNamedRangeContent': {
+                'namedRangeName': range_name,
+                'text': new_content
+            }
+        }]
         
         return self._execute_batch_update(doc_id, requests)
     
@@ -965,23 +1692,332 @@ class GoogleDocsAdvancedToolkit:
     # UTILITY METHODS
     # ========================================================================
     
-    def _execute_batch_update(self, doc_id: str, requests: List[Dict]) -> bool:
-        """Execute a batch update request"""
+    @contextmanager
+    def batch(self, doc_id: str, sort_by_index: bool = False):
+        """Queue every request for doc_id made inside the block and send
+        them as a single batchUpdate when it exits
+        
+        Methods that need a reply (named ranges, bookmarks, footnotes,
+        headers, footers) return a DeferredReply instead; its value is set
+        after the flush. Text for new footnotes, headers and footers goes
+        out together in one follow-up batchUpdate.
+        
+            with toolkit.batch(doc_id) as b:
+                b.insert_text_with_style(doc_id, "Title\n", 1, title_style)
+                b.format_paragraph(doc_id, 1, 7, centered)
+        
+        With sort_by_index, indexes may all be given against the document
+        as it was before the batch: each call's requests are sent from the
+        highest index down, so no call shifts the positions of those after
+        it. Calls without an index (document style, replaceAllText, ...)
+        stay where they were and bound the reordering.
+        
+        Batches nest: a batch for the document already being batched joins
+        the open one (and is sent with it), while a batch for another
+        document is queued and sent separately, leaving the outer batch's
+        queue untouched.
+        """
+        if self._batch_requests is not None and doc_id == self._batch_doc_id:
+            yield self
+            return
+        
+        outer = (self._batch_doc_id, self._batch_requests, self._batch_deferred,
+                 self._batch_groups, self._batch_sort)
+        self._batch_doc_id = doc_id
+        self._batch_requests = []
+        self._batch_deferred = []
+        self._batch_groups = []
+        self._batch_sort = sort_by_index
+        try:
+            yield self
+            self.flush()
+        finally:
+            (self._batch_doc_id, self._batch_requests, self._batch_deferred,
+             self._batch_groups, self._batch_sort) = outer
+    
+    def flush(self) -> bool:
+        """Send the requests queued by batch() so far"""
+        if not self._batch_requests:
+            return True
+        
+        doc_id = self._batch_doc_id
+        requests, deferred = self._batch_requests, self._batch_deferred
+        if self._batch_sort:
+            requests = self._sort_by_index(requests, self._batch_groups, deferred)
+        self._batch_requests, self._batch_deferred, self._batch_groups = [], [], []
+        return self._send_with_replies(doc_id, requests, deferred)
+    
+    def _send_with_replies(self, doc_id: str, requests: List[Dict],
+                           deferred: List[DeferredReply]) -> bool:
+        """Send requests, fill in their DeferredReplys and send any
+        follow-up requests those produce"""
+        requests = coalesce_style_updates(requests, deferred)
+        
         try:
+            self._invalidate_reads(doc_id)
             result = self.docs_service.documents().batchUpdate(
                 documentId=doc_id,
                 body={'requests': requests}
-            ).execute()
+            ).execute(num_retries=MAX_RETRIES)
+        except HttpError as e:
+            logger.error("✗ Error executing batch update: %s", e)
+            return False
+        
+        logger.debug("✓ Executed %s operations successfully", len(requests))
+        replies = result.get('replies', [])
+        follow_ups = []
+        for reply in deferred:
+            reply.value = reply.extract(replies[reply.index])
+            if reply.follow_up:
+                follow_ups.extend(reply.follow_up(reply.value))
+        
+        if follow_ups:
+            # Target the revision the creates produced, so the segment
+            # indexes stay valid if collaborators edit in between
+            revision_id = result.get('writeControl', {}).get('requiredRevisionId')
+            return self._send_batch_update(doc_id, follow_ups, revision_id)
+        return True
+    
+    @staticmethod
+    def _sort_by_index(requests: List[Dict], group_starts: List[int],
+                       deferred: Iterable[DeferredReply]) -> List[Dict]:
+        """Reorder queued calls by descending index, keeping each call's
+        own requests together and in order; deferred indexes are remapped"""
+        bounds = group_starts + [len(requests)]
+        groups = [(bounds[i], requests[bounds[i]:bounds[i + 1]])
+                  for i in range(len(group_starts))]
+        
+        ordered = []
+        run = []
+        for start, group in groups:
+            index = _request_index(group[0])
+            if index is None:
+                run.sort(key=lambda item: -item[0])
+                ordered.extend(run)
+                run = []
+                ordered.append((None, start, group))
+            else:
+                run.append((index, start, group))
+        run.sort(key=lambda item: -item[0])
+        ordered.extend(run)
+        
+        new_starts = {}
+        sorted_requests = []
+        for _, start, group in ordered:
+            new_starts[start] = len(sorted_requests)
+            sorted_requests.extend(group)
+        for reply in deferred:
+            reply.index = new_starts[reply.index]
+        return sorted_requests
+    
+    def _create_segment(self, doc_id: str, request: Dict, extract, follow_up):
+        """Create a footnote, header or footer and insert its text
+        
+        The segment id is assigned by the server, so the text can only be
+        sent after the create has replied. Inside batch() both steps join
+        the queue; otherwise they are sent straight away as a two-step
+        pipeline, without disturbing a batch open for another document.
+        """
+        deferred = self._queue_for_reply(doc_id, request, extract, follow_up)
+        if deferred:
+            return deferred
+        
+        return self._send_with_replies(
+            doc_id, [request], [DeferredReply(0, extract, follow_up)]
+        )
+    
+    def _queue_for_reply(self, doc_id: str, request: Dict, extract,
+                         follow_up=None) -> Optional[DeferredReply]:
+        """Queue a request whose reply is needed, if batching doc_id"""
+        if self._batch_requests is None or doc_id != self._batch_doc_id:
+            return None
+        
+        deferred = DeferredReply(len(self._batch_requests), extract, follow_up)
+        self._batch_groups.append(len(self._batch_requests))
+        self._batch_requests.append(request)
+        self._batch_deferred.append(deferred)
+        return deferred
+    
+    def _execute_batch_update(self, doc_id: str, requests: List[Dict],
+                              sort_by_index: bool = False) -> bool:
+        """Execute a batch update request, or queue it inside batch()
+        
+        With sort_by_index, requests may use indexes in the document as it
+        was before this update: they are sent highest index first (ties
+        keep their order), so no edit shifts the ones after it.
+        """
+        if sort_by_index:
+            requests = self._sort_by_index(requests, list(range(len(requests))), ())
+        if self._batch_requests is not None and doc_id == self._batch_doc_id:
+            if requests:
+                self._batch_groups.append(len(self._batch_requests))
+                self._batch_requests.extend(requests)
+            return True
+        return self._send_batch_update(doc_id, requests)
+    
+    def _send_batch_update(self, doc_id: str, requests: List[Dict],
+                           target_revision_id: Optional[str] = None) -> bool:
+        """Send a batch update request"""
+        requests = coalesce_style_updates(requests)
+        body = {'requests': requests}
+        if target_revision_id:
+            body['writeControl'] = {'targetRevisionId': target_revision_id}
+        
+        try:
+            self._invalidate_reads(doc_id)
+            result = self.docs_service.documents().batchUpdate(
+                documentId=doc_id,
+                body=body
+            ).execute(num_retries=MAX_RETRIES)
             
-            print(f"✓ Executed {len(requests)} operations successfully")
+            logger.debug("✓ Executed %s operations successfully", len(requests))
             return True
             
         except HttpError as e:
-            print(f"✗ Error executing batch update: {e}")
+            logger.error("✗ Error executing batch update: %s", e)
             return False
     
-    def export_as_pdf(self, doc_id: str, output_file: str) -> bool:
-        """Export document as PDF"""
+    def _cached_read(self, doc_id: str, kind: str, fetch):
+        """Return fetch(), reusing its result for read_cache_ttl seconds
+        
+        Errors propagate uncached. The response is shared between callers
+        and must not be mutated.
+        """
+        if not self.read_cache_ttl:
+            return fetch()
+        
+        key = (doc_id, kind)
+        now = time.monotonic()
+        with self._read_cache_lock:
+            entry = self._read_cache.get(key)
+        if entry and now - entry[0] < self.read_cache_ttl:
+            return entry[1]
+        
+        response = fetch()
+        with self._read_cache_lock:
+            self._read_cache[key] = (now, response)
+            self._read_cache.move_to_end(key)
+            while len(self._read_cache) > READ_CACHE_SIZE:
+                self._read_cache.popitem(last=False)
+        return response
+    
+    def _invalidate_reads(self, doc_id: str):
+        """Forget cached reads of doc_id; called before every write to it"""
+        if not self._read_cache and not self._document_cache:
+            return
+        with self._read_cache_lock:
+            for cache in (self._read_cache, self._document_cache):
+                for key in [key for key in cache if key[0] == doc_id]:
+                    del cache[key]
+            self._named_range_index.pop(doc_id, None)
+    
+    def _get_document(self, doc_id: str, fields: Optional[str] = None) -> Dict:
+        """documents().get that reuses the last response for (doc_id, fields)
+        
+        A cached document is revalidated with a revisionId-only GET and
+        refetched only if the revision changed. Documents without a
+        revisionId (no edit access) are never cached. The response is
+        shared between callers and must not be mutated.
+        """
+        key = (doc_id, fields)
+        with self._read_cache_lock:
+            entry = self._document_cache.get(key)
+        if entry:
+            revision_id = self.docs_service.documents().get(
+                documentId=doc_id,
+                fields='revisionId'
+            ).execute(num_retries=MAX_RETRIES).get('revisionId')
+            if revision_id == entry[0]:
+                with self._read_cache_lock:
+                    if key in self._document_cache:
+                        self._document_cache.move_to_end(key)
+                return entry[1]
+        
+        kwargs = {'fields': f'{fields},revisionId'} if fields else {}
+        document = self.docs_service.documents().get(
+            documentId=doc_id,
+            **kwargs
+        ).execute(num_retries=MAX_RETRIES)
+        
+        revision_id = document.get('revisionId')
+        with self._read_cache_lock:
+            if revision_id:
+                self._document_cache[key] = (revision_id, document)
+                self._document_cache.move_to_end(key)
+                while len(self._document_cache) > DOCUMENT_CACHE_SIZE:
+                    self._document_cache.popitem(last=False)
+            else:
+                self._document_cache.pop(key, None)
+        return document
+    
+    def _rest_get_document(self, doc_id: str, fields: str) -> Dict:
+        """GET a document over the pooled session; safe to call from threads"""
+        response = self.session.get(f'{DOCS_API_URL}/{doc_id}', params={'fields': fields})
+        response.raise_for_status()
+        return response.json()
+    
+    def _rest_batch_update(self, doc_id: str, update_requests: List[Dict]) -> Dict:
+        """POST a batchUpdate over the pooled session; safe to call from threads
+        
+        The update carries writeControl.requiredRevisionId, so when an
+        attempt that timed out or failed with a 5xx was in fact applied, its
+        retry is rejected by the server instead of applying twice.
+        """
+        self._invalidate_reads(doc_id)
+        revision_id = self._rest_get_document(doc_id, 'revisionId').get('revisionId')
+        body = {'requests': update_requests}
+        if revision_id:
+            body['writeControl'] = {'requiredRevisionId': revision_id}
+        data = compact_json(body)
+        # Without a revision to pin to, a replay could apply twice
+        attempts = MAX_RETRIES + 1 if revision_id else 1
+        
+        for attempt in range(attempts):
+            if attempt:
+                time.sleep(SESSION_RETRY.backoff_factor * 2 ** (attempt - 1))
+            last = attempt == attempts - 1
+            try:
+                response = self.session.post(
+                    f'{DOCS_API_URL}/{doc_id}:batchUpdate',
+                    data=data,
+                    headers={'Content-Type': 'application/json'}
+                )
+            except (requests.ConnectionError, requests.Timeout):
+                if last:
+                    raise
+                continue
+            if response.status_code in RETRY_STATUSES and not last:
+                continue
+            response.raise_for_status()
+            return response.json()
+    
+    def batch_update_many(self, updates: Dict[str, List[Dict]],
+                          max_workers: int = MAX_CONCURRENT_REQUESTS) -> Dict[str, bool]:
+        """Apply a list of requests to each of several documents concurrently
+        
+        Calls share the pooled keep-alive connections of self.session rather
+        than running one after another through the discovery client.
+        """
+        def apply(doc_id):
+            try:
+                self._rest_batch_update(doc_id, updates[doc_id])
+                return True
+            except requests.RequestException as e:
+                logger.error("✗ Error updating %s: %s", doc_id, e)
+                return False
+        
+        results = dict(zip(updates, self._map_concurrently(apply, list(updates), max_workers)))
+        
+        logger.debug("✓ Updated %s/%s documents", sum(results.values()), len(results))
+        return results
+    
+    def export_as_pdf(self, doc_id: str, output_file: str,
+                      progress: Optional[Callable[[int, Optional[int]], None]] = None) -> bool:
+        """Export document as PDF
+        
+        progress, if given, is called after each downloaded chunk with
+        (bytes so far, total bytes or None), e.g. to drive a progress bar.
+        """
         try:
             # Get file content as PDF
             request = self.drive_service.files().export_media(
@@ -989,43 +2025,202 @@ class GoogleDocsAdvancedToolkit:
                 mimeType='application/pdf'
             )
             
-            # Download the PDF
-            import io
-            from googleapiclient.http import MediaIoBaseDownload
-            
-            fh = io.BytesIO()
-            downloader = MediaIoBaseDownload(fh, request)
+            # Stream the PDF straight to disk rather than buffering it in
+            # memory; the rename keeps a failed export from leaving a
+            # truncated file at output_file
+            partial_file = output_file + '.part'
+            try:
+                with open(partial_file, 'wb') as f:
+                    downloader = MediaIoBaseDownload(f, request)
+                    done = False
+                    while not done:
+                        status, done = downloader.next_chunk(num_retries=MAX_RETRIES)
+                        if status:
+                            logger.debug("  %s: %d%%", output_file, int(status.progress() * 100))
+                            if progress:
+                                progress(status.resumable_progress, status.total_size)
+                os.replace(partial_file, output_file)
+            finally:
+                if os.path.exists(partial_file):
+                    os.remove(partial_file)
             
-            done = False
-            while not done:
-                status, done = downloader.next_chunk()
-                
-            # Write to file
-            with open(output_file, 'wb') as f:
-                f.write(fh.getvalue())
-                
-            print(f"✓ Exported document as PDF: {output_file}")
+            logger.debug("✓ Exported document as PDF: %s", output_file)
             return True
             
         except HttpError as e:
-            print(f"✗ Error exporting as PDF: {e}")
+            logger.error("✗ Error exporting as PDF: %s", e)
             return False
     
-    def get_revision_history(self, doc_id: str) -> List[Dict]:
-        """Get document revision history"""
+    def _fetch_revision_history(self, doc_id: str, limit: Optional[int]) -> List[Dict]:
+        # Google Docs files have no headRevisionId; version increases on
+        # every change to the file, so an unchanged version means the
+        # revision list is unchanged too
+        version = self.drive_service.files().get(
+            fileId=doc_id,
+            fields='version'
+        ).execute(num_retries=MAX_RETRIES).get('version')
+        
+        cached = self._revision_history.get((doc_id, limit))
+        if cached and version is not None and cached[0] == version:
+            return cached[1]
+        
+        revisions = list(islice(self.iter_revisions(doc_id), limit))
+        self._revision_history[doc_id, limit] = (version, revisions)
+        return revisions
+    
+    def iter_revisions(self, doc_id: str,
+                       page_size: int = REVISIONS_PAGE_SIZE) -> Iterator[Dict]:
+        """Yield the document's revisions oldest first, a page at a time
+        
+        Only one page is held in memory and later pages are fetched only
+        if the caller keeps iterating. HttpError propagates to the caller.
+        """
+        revisions = self.drive_service.revisions()
+        request = revisions.list(
+            fileId=doc_id,
+            pageSize=page_size,
+            fields='nextPageToken,revisions(id,modifiedTime,lastModifyingUser)'
+        )
+        while request is not None:
+            response = request.execute(num_retries=MAX_RETRIES)
+            yield from response.get('revisions', [])
+            request = revisions.list_next(request, response)
+    
+    def get_revision_content(self, doc_id: str, revision_id: str,
+                             mime_type: str = 'text/plain') -> Optional[str]:
+        """Download a single past revision, exported as mime_type"""
         try:
-            revisions = self.drive_service.revisions().list(
+            revision = self.drive_service.revisions().get(
                 fileId=doc_id,
-                fields='revisions(id,modifiedTime,lastModifyingUser)'
-            ).execute()
+                revisionId=revision_id,
+                fields='exportLinks'
+            ).execute(num_retries=MAX_RETRIES)
             
-            return revisions.get('revisions', [])
+            link = revision.get('exportLinks', {}).get(mime_type)
+            if not link:
+                logger.error("✗ Revision %s cannot be exported as %s", revision_id, mime_type)
+                return None
+            
+            response = self.session.get(link)
+            response.raise_for_status()
+            return response.text
+            
+        except (HttpError, requests.RequestException) as e:
+            logger.error("✗ Error getting revision content: %s", e)
+            return None
+    
+    def iter_revision_diffs(self, doc_id: str) -> Iterator[Dict]:
+        """Yield each revision with a unified diff of its text against the
+        revision before it (the first is diffed against an empty document)
+        
+        Revisions are downloaded one at a time as iteration proceeds and
+        only the previous revision's text is kept, so stopping early skips
+        the remaining downloads. Revisions that cannot be downloaded are
+        skipped.
+        """
+        previous_id, previous_lines = '', []
+        for revision in self.iter_revisions(doc_id):
+            text = self.get_revision_content(doc_id, revision['id'])
+            if text is None:
+                continue
+            
+            lines = text.splitlines(keepends=True)
+            yield {
+                'revisionId': revision['id'],
+                'modifiedTime': revision.get('modifiedTime'),
+                'diff': ''.join(difflib.unified_diff(
+                    previous_lines, lines, fromfile=previous_id, tofile=revision['id']
+                ))
+            }
+            previous_id, previous_lines = revision['id'], lines
+    
+    def get_revision_history(self, doc_id: str, limit: Optional[int] = None) -> List[Dict]:
+        """Get document revision history (the first limit revisions, if given)
+        
+        The list is re-fetched only when the file's Drive version has moved
+        since the last call, so polling an unchanged document costs one
+        small files.get instead of paging through every revision.
+        """
+        try:
+            return list(self._cached_read(
+                doc_id, f'revisions:{limit}',
+                lambda: self._fetch_revision_history(doc_id, limit)
+            ))
             
         except HttpError as e:
-            print(f"✗ Error getting revision history: {e}")
+            logger.error("✗ Error getting revision history: %s", e)
             return []
 
 
+# ============================================================================
+# ASYNC FRONT END
+# ============================================================================
+
+class AsyncGoogleDocsToolkit:
+    """asyncio front end for GoogleDocsAdvancedToolkit
+    
+    Each call runs the synchronous method on the toolkit's shared worker
+    pool, where it gets that thread's own API clients, so operations on many
+    documents overlap on the network instead of queuing behind each other.
+    max_workers caps how many of this front end's calls run at once.
+    
+        docs = AsyncGoogleDocsToolkit()
+        await docs.gather(docs.export_as_pdf(d, f"{d}.pdf") for d in doc_ids)
+    """
+    
+    def __init__(self, toolkit: Optional[GoogleDocsAdvancedToolkit] = None,
+                 max_workers: int = MAX_CONCURRENT_REQUESTS,
+                 key_file='service-account-key.json'):
+        self._owns_toolkit = toolkit is None
+        self.toolkit = toolkit or GoogleDocsAdvancedToolkit(key_file)
+        self._executor = self.toolkit._get_executor()
+        self._max_workers = max_workers
+        # Created on first use, inside the running event loop
+        self._slots = None
+    
+    async def _call(self, method, *args):
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._max_workers)
+        loop = asyncio.get_running_loop()
+        async with self._slots:
+            return await loop.run_in_executor(self._executor, partial(method, *args))
+    
+    async def gather(self, coros: Iterable, max_concurrency: int = 50) -> List:
+        """Await coros with at most max_concurrency running at once;
+        results come back in input order"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(coro):
+            async with semaphore:
+                return await coro
+        
+        return await asyncio.gather(*(run(coro) for coro in coros))
+    
+    async def get_document_metadata(self, doc_id: str) -> Dict:
+        return await self._call(self.toolkit.get_document_metadata, doc_id)
+    
+    async def get_all_named_ranges(self, doc_id: str) -> List[Dict]:
+        return await self._call(self.toolkit.get_all_named_ranges, doc_id)
+    
+    async def replace_named_range_content(self, doc_id: str, range_name: str,
+                                          new_content: str) -> bool:
+        return await self._call(
+            self.toolkit.replace_named_range_content, doc_id, range_name, new_content
+        )
+    
+    async def export_as_pdf(self, doc_id: str, output_file: str) -> bool:
+        return await self._call(self.toolkit.export_as_pdf, doc_id, output_file)
+    
+    async def copy_document(self, doc_id: str, new_title: str) -> str:
+        return await self._call(self.toolkit.copy_document, doc_id, new_title)
+    
+    def close(self):
+        """Shut down the worker threads if this front end created the toolkit;
+        a toolkit passed in keeps its pool for its other users"""
+        if self._owns_toolkit:
+            self.toolkit.close()
+
+
 # ============================================================================
 # DEMONSTRATION AND USAGE
 # ============================================================================
@@ -1070,7 +2265,8 @@ def demonstrate_advanced_features():
             "insert_table_row/column(doc_id, table_index, position)",
             "delete_table_row/column(doc_id, table_index, position)",
             "merge_table_cells(doc_id, table_index, row_start, row_end, col_start, col_end)",
-            "update_table_cell_style(doc_id, table_index, row, col, style)"
+            "update_table_cell_style(doc_id, table_index, row, col, style)",
+            "update_table_cell_range_style(doc_id, table_index, row_start, row_end, col_start, col_end, style)"
         ],
         "Images and Objects": [
             "insert_image(doc_id, index, image_url, width, height)",
@@ -1086,9 +2282,15 @@ def demonstrate_advanced_features():
             "update_document_style(doc_id, margins, page_size)"
         ],
         "Advanced Features": [
+            "append_section(doc_id, index, blocks)",
             "create_bookmark(doc_id, position)",
             "get_all_named_ranges(doc_id)",
-            "get_revision_history(doc_id)"
+            "get_named_ranges_by_name(doc_id)",
+            "bulk_export_as_pdf(doc_ids, output_dir)",
+            "get_revision_history(doc_id, limit)",
+            "iter_revisions(doc_id, page_size)",
+            "get_revision_content(doc_id, revision_id, mime_type)",
+            "iter_revision_diffs(doc_id)"
         ]
     }
     
@@ -1104,4 +2306,5 @@ def demonstrate_advanced_features():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get('BMPOA_LOGLEVEL', 'INFO'), format='%(message)s')
     toolkit = demonstrate_advanced_features()
\ No newline at end of file
@@ -20,6 +20,10 @@ SCOPES = ['https://www.googleapis.com/auth/documents']
 # For read-only access (more secure if you only need to read)
 # SCOPES = ['https://www.googleapis.com/auth/documents.readonly']
 
+# Credentials already loaded in this process, keyed by token file path, so
+# later authenticators skip reading and parsing the token file
+_CRED_CACHE = {}
+
 class GoogleDocsAuthenticator:
     def __init__(self, credentials_file='credentials.json', token_file='token.json'):
         self.credentials_file = credentials_file
@@ -88,7 +92,9 @@ class GoogleDocsAuthenticator:
             return None
             
         # Token file stores the user's access and refresh tokens
-        if os.path.exists(self.token_file):
+        token_key = os.path.abspath(self.token_file)
+        self.creds = _CRED_CACHE.get(token_key)
+        if not self.creds and os.path.exists(self.token_file):
             print("Loading saved credentials...")
             self.creds = Credentials.from_authorized_user_file(self.token_file, SCOPES)
             
@@ -116,11 +122,15 @@ class GoogleDocsAuthenticator:
                 token.write(self.creds.to_json())
                 print(f"\n✓ Credentials saved to {self.token_file}")
                 
+        _CRED_CACHE[token_key] = self.creds
         print("✓ Authentication successful!")
         return self.creds
         
     def build_service(self):
         """Build and return the Google Docs service"""
+        if self.service is not None:
+            return self.service
+        
         if not self.creds:
             print("Error: Not authenticated. Run authenticate() first.")
             return None
@@ -146,7 +156,12 @@ class GoogleDocsAuthenticator:
             
         try:
             print(f"\nTesting connection with document: {document_id}")
-            document = self.service.documents().get(documentId=document_id).execute()
+            # Only the title and one endIndex per element are needed for
+            # the summary below, not the whole body
+            document = self.service.documents().get(
+                documentId=document_id,
+                fields='title,body(content(endIndex))'
+            ).execute()
             
             print("\n✓ SUCCESS! Connected to Google Docs API")
             print(f"Document Title: {document.get('title')}")
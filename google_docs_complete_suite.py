@@ -7,84 +7,159 @@ Integrated toolkit with all Google Docs API features and safe data handling
 import os
 import json
 import time
+import logging
+from collections import deque
+from itertools import islice
 from typing import List, Dict, Optional, Any, Union
 from datetime import datetime
+from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload
 from google_docs_advanced_toolkit import (
-    GoogleDocsAdvancedToolkit, TextStyle, ParagraphStyle,
-    ParagraphAlignment, NamedStyleType, ListGlyphType, SectionType
+    GoogleDocsAdvancedToolkit, TextStyle, ParagraphStyle, rgb_color, logger, MAX_RETRIES
 )
 from google_docs_specialized_tools import GoogleDocsSpecializedTools
 
+# namedStyleType -> key used in analysis['structure']['headings'] and
+# batch_format_headings' heading_styles
+HEADING_KEYS = {f'HEADING_{level}': f'h{level}' for level in range(1, 7)}
+
 
 class GoogleDocsCompleteSuite(GoogleDocsSpecializedTools):
     """Complete Google Docs manipulation suite with all features integrated"""
     
     def __init__(self, key_file='service-account-key.json'):
         super().__init__(key_file)
-        self.operation_history = []
         self.max_history = 100  # Limit history to prevent memory issues
+        self.operation_history = deque(maxlen=self.max_history)
         
     # ========================================================================
     # SAFE DATA HANDLING
     # ========================================================================
     
-    def safe_insert_image_from_file(self, doc_id: str, index: int, 
-                                   image_path: str, max_size_mb: int = 5) -> bool:
-        """Insert image with size checking to prevent memory issues"""
-        # Check file size
+    def _upload_image(self, image_path: str, max_size_mb: int) -> Optional[Dict]:
+        """Upload an image to Drive after checking its size; returns the
+        file's id and webContentLink, or None if it is too large"""
         file_size_mb = os.path.getsize(image_path) / (1024 * 1024)
         if file_size_mb > max_size_mb:
-            print(f"✗ Image too large: {file_size_mb:.2f}MB (max: {max_size_mb}MB)")
-            print(f"  Please compress the image before inserting")
-            return False
+            logger.error("✗ Image too large: %.2fMB (max: %sMB)", file_size_mb, max_size_mb)
+            logger.error("  Please compress the image before inserting")
+            return None
+        
+        file_metadata = {
+            'name': os.path.basename(image_path),
+            'mimeType': 'image/jpeg'  # Adjust based on actual type
+        }
         
+        # The link comes back with the create, so no follow-up files.get
+        media = MediaFileUpload(image_path, resumable=True)
+        return self.drive_service.files().create(
+            body=file_metadata,
+            media_body=media,
+            fields='id,webContentLink'
+        ).execute(num_retries=MAX_RETRIES)
+    
+    def _delete_uploads(self, file_ids: List[str]):
+        """Delete uploaded images that did not make it into the document,
+        so no public copies are left behind in Drive"""
+        files = self.drive_service.files()
+        try:
+            responses = self._execute_http_batch(self.drive_service, {
+                file_id: files.delete(fileId=file_id) for file_id in file_ids
+            })
+        except Exception as e:
+            logger.error("✗ Error deleting uploaded images: %s", e)
+            return
+        
+        for file_id, response in responses.items():
+            if isinstance(response, Exception):
+                logger.error("✗ Error deleting uploaded image %s: %s", file_id, response)
+    
+    def safe_insert_image_from_file(self, doc_id: str, index: int, 
+                                   image_path: str, max_size_mb: int = 5) -> bool:
+        """Insert image with size checking to prevent memory issues"""
         # Instead of base64 encoding, upload to Drive first
+        file = None
         try:
-            # Upload to Drive
-            from googleapiclient.http import MediaFileUpload
-            
-            file_metadata = {
-                'name': os.path.basename(image_path),
-                'mimeType': 'image/jpeg'  # Adjust based on actual type
-            }
-            
-            media = MediaFileUpload(image_path, resumable=True)
-            file = self.drive_service.files().create(
-                body=file_metadata,
-                media_body=media,
-                fields='id,webContentLink'
-            ).execute()
-            
-            # Get shareable link
-            file_id = file.get('id')
+            file = self._upload_image(image_path, max_size_mb)
+            if file is None:
+                return False
             
             # Make it publicly accessible
             self.drive_service.permissions().create(
-                fileId=file_id,
+                fileId=file.get('id'),
                 body={'type': 'anyone', 'role': 'reader'}
-            ).execute()
+            ).execute(num_retries=MAX_RETRIES)
             
-            # Get the direct link
-            file_info = self.drive_service.files().get(
-                fileId=file_id,
-                fields='webContentLink'
-            ).execute()
+            # Insert into document
+            if self.insert_image(doc_id, index, file.get('webContentLink')):
+                logger.info("✓ Inserted image from file: %s", image_path)
+                return True
             
-            image_url = file_info.get('webContentLink')
+        except Exception as e:
+            logger.error("✗ Error inserting image: %s", e)
+        
+        if file is not None:
+            self._delete_uploads([file['id']])
+        return False
+    
+    def safe_insert_images_from_files(self, doc_id: str, index: int,
+                                      image_paths: List[str], max_size_mb: int = 5) -> int:
+        """Insert several images one after another starting at index
+        
+        Uploads run one by one (media uploads cannot be batched), but the
+        sharing permissions go out as one Drive batch request and the
+        images are inserted with one batchUpdate. Uploads that end up
+        unused are deleted again. Inside batch() for doc_id the inserts
+        join that batch. Returns the number of images inserted.
+        """
+        uploaded = []
+        shared = []
+        try:
+            for image_path in image_paths:
+                file = self._upload_image(image_path, max_size_mb)
+                if file is not None:
+                    uploaded.append(file)
             
-            # Insert into document
-            result = self.insert_image(doc_id, index, image_url)
+            permissions = self.drive_service.permissions()
+            responses = self._execute_http_batch(self.drive_service, {
+                file['id']: permissions.create(
+                    fileId=file['id'],
+                    body={'type': 'anyone', 'role': 'reader'}
+                )
+                for file in uploaded
+            })
+            shared = [file for file in uploaded if isinstance(responses.get(file['id']), dict)]
             
-            print(f"✓ Inserted image from file: {image_path}")
-            return result
+            # Each inline image takes up one index
+            if self._batch_requests is not None and doc_id == self._batch_doc_id:
+                for offset, file in enumerate(shared):
+                    self.insert_image(doc_id, index + offset, file.get('webContentLink'))
+            else:
+                with self.batch(doc_id):
+                    for offset, file in enumerate(shared):
+                        self.insert_image(doc_id, index + offset, file.get('webContentLink'))
+                    if not self.flush():
+                        shared = []
             
         except Exception as e:
-            print(f"✗ Error inserting image: {e}")
-            return False
+            logger.error("✗ Error inserting images: %s", e)
+            shared = []
+        
+        shared_ids = {file['id'] for file in shared}
+        unused = [file['id'] for file in uploaded if file['id'] not in shared_ids]
+        if unused:
+            self._delete_uploads(unused)
+        
+        logger.info("✓ Inserted %s of %s images", len(shared), len(image_paths))
+        return len(shared)
     
     def export_as_format(self, doc_id: str, output_file: str, 
-                        format_type: str = 'pdf', chunk_size: int = 1024*1024) -> bool:
-        """Export document with chunked downloading to prevent memory issues"""
+                        format_type: str = 'pdf', chunk_size: int = 8*1024*1024,
+                        show_progress: bool = False) -> bool:
+        """Export document with chunked downloading to prevent memory issues
+        
+        Larger chunks mean fewer HTTP round trips for multi-MB exports;
+        per-chunk progress is only logged at INFO when show_progress is set.
+        """
         mime_types = {
             'pdf': 'application/pdf',
             'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
@@ -95,7 +170,7 @@ class GoogleDocsCompleteSuite(GoogleDocsSpecializedTools):
         }
         
         if format_type not in mime_types:
-            print(f"✗ Unsupported format: {format_type}")
+            logger.error("✗ Unsupported format: %s", format_type)
             return False
         
         try:
@@ -105,24 +180,28 @@ class GoogleDocsCompleteSuite(GoogleDocsSpecializedTools):
                 mimeType=mime_types[format_type]
             )
             
-            # Download in chunks to prevent memory issues
-            with open(output_file, 'wb') as f:
-                import io
-                from googleapiclient.http import MediaIoBaseDownload
-                
-                downloader = MediaIoBaseDownload(f, request, chunksize=chunk_size)
-                done = False
-                
-                while not done:
-                    status, done = downloader.next_chunk()
-                    if status:
-                        print(f"  Download progress: {int(status.progress() * 100)}%")
+            # Download in chunks to prevent memory issues; the rename keeps
+            # a failed export from leaving a truncated file at output_file
+            partial_file = output_file + '.part'
+            try:
+                with open(partial_file, 'wb') as f:
+                    downloader = MediaIoBaseDownload(f, request, chunksize=chunk_size)
+                    done = False
+                    
+                    while not done:
+                        status, done = downloader.next_chunk(num_retries=MAX_RETRIES)
+                        if show_progress and status:
+                            logger.info("  Download progress: %s%%", int(status.progress() * 100))
+                os.replace(partial_file, output_file)
+            finally:
+                if os.path.exists(partial_file):
+                    os.remove(partial_file)
             
-            print(f"✓ Exported document as {format_type}: {output_file}")
+            logger.info("✓ Exported document as %s: %s", format_type, output_file)
             return True
             
         except Exception as e:
-            print(f"✗ Error exporting document: {e}")
+            logger.error("✗ Error exporting document: %s", e)
             return False
     
     # ========================================================================
@@ -140,43 +219,35 @@ class GoogleDocsCompleteSuite(GoogleDocsSpecializedTools):
             'success': success
         }
         
+        # The deque drops the oldest record once max_history is reached
         self.operation_history.append(record)
-        
-        # Limit history size
-        if len(self.operation_history) > self.max_history:
-            self.operation_history = self.operation_history[-self.max_history:]
     
     def get_operation_history(self, limit: int = 10) -> List[Dict]:
         """Get recent operation history"""
-        return self.operation_history[-limit:]
+        start = max(0, len(self.operation_history) - limit)
+        return list(islice(self.operation_history, start, None))
     
     def save_checkpoint(self, doc_id: str, checkpoint_name: str) -> bool:
         """Save document state as checkpoint for later restoration"""
         try:
-            # Get current document state
-            document = self.docs_service.documents().get(
-                documentId=doc_id,
-                fields='*'
-            ).execute()
+            # Get current document state, leaving out inline objects to
+            # prevent large data issues
+            document = self._get_document(
+                doc_id, 'title,body,documentStyle,namedStyles,lists,footnotes'
+            )
             
-            # Save to file (excluding large binary data)
             checkpoint_file = f"checkpoint_{doc_id}_{checkpoint_name}.json"
             
-            # Remove inline objects to prevent large data issues
-            if 'inlineObjects' in document:
-                document['inlineObjects'] = {
-                    k: {'note': 'removed for checkpoint'} 
-                    for k in document['inlineObjects'].keys()
-                }
-            
-            with open(checkpoint_file, 'w') as f:
-                json.dump(document, f, indent=2)
+            # Stream compact JSON through a large buffer; indenting would
+            # roughly double the file size and serialization time
+            with open(checkpoint_file, 'w', buffering=1 << 20) as f:
+                json.dump(document, f, separators=(',', ':'))
             
-            print(f"✓ Saved checkpoint: {checkpoint_file}")
+            logger.info("✓ Saved checkpoint: %s", checkpoint_file)
             return True
             
         except Exception as e:
-            print(f"✗ Error saving checkpoint: {e}")
+            logger.error("✗ Error saving checkpoint: %s", e)
             return False
     
     # ========================================================================
@@ -186,10 +257,9 @@ class GoogleDocsCompleteSuite(GoogleDocsSpecializedTools):
     def analyze_document(self, doc_id: str) -> Dict[str, Any]:
         """Comprehensive document analysis"""
         try:
-            document = self.docs_service.documents().get(
-                documentId=doc_id,
-                fields='title,body,documentStyle,namedStyles,lists,footnotes'
-            ).execute()
+            document = self._get_document(
+                doc_id, 'title,body,documentStyle,namedStyles,lists,footnotes'
+            )
             
             analysis = {
                 'title': document.get('title'),
@@ -219,29 +289,29 @@ class GoogleDocsCompleteSuite(GoogleDocsSpecializedTools):
             
             # Analyze content
             content = document.get('body', {}).get('content', [])
-            full_text = ''
+            text_parts = []
+            headings = analysis['structure']['headings']
+            styles_used = analysis['formatting']['styles_used']
+            fonts_used = analysis['formatting']['fonts_used']
+            colors_used = analysis['formatting']['colors_used']
             
             for element in content:
                 if 'paragraph' in element:
                     analysis['statistics']['total_paragraphs'] += 1
-                    para_text = ''
-                    
                     # Check style
                     style = element['paragraph'].get('paragraphStyle', {})
                     named_style = style.get('namedStyleType', '')
                     if named_style:
-                        analysis['formatting']['styles_used'].add(named_style)
-                        if 'HEADING' in named_style:
-                            level = named_style.split('_')[-1]
-                            if level.isdigit():
-                                analysis['structure']['headings'][f'h{level}'] += 1
+                        styles_used.add(named_style)
+                        heading = HEADING_KEYS.get(named_style)
+                        if heading:
+                            headings[heading] += 1
                     
                     # Extract text and formatting
                     for elem in element['paragraph'].get('elements', []):
                         if 'textRun' in elem:
                             text = elem['textRun'].get('content', '')
-                            para_text += text
-                            full_text += text
+                            text_parts.append(text)
                             
                             # Check text style
                             text_style = elem['textRun'].get('textStyle', {})
@@ -249,7 +319,7 @@ class GoogleDocsCompleteSuite(GoogleDocsSpecializedTools):
                             # Font
                             font = text_style.get('weightedFontFamily', {}).get('fontFamily')
                             if font:
-                                analysis['formatting']['fonts_used'].add(font)
+                                fonts_used.add(font)
                             
                             # Color
                             fg_color = text_style.get('foregroundColor', {}).get('color', {}).get('rgbColor', {})
@@ -258,7 +328,7 @@ class GoogleDocsCompleteSuite(GoogleDocsSpecializedTools):
                                        fg_color.get('green', 0), 
                                        fg_color.get('blue', 0))
                                 if color != (0, 0, 0):  # Not default black
-                                    analysis['formatting']['colors_used'].add(str(color))
+                                    colors_used.add(str(color))
                 
                 elif 'table' in element:
                     analysis['structure']['tables'] += 1
@@ -267,22 +337,24 @@ class GoogleDocsCompleteSuite(GoogleDocsSpecializedTools):
                     analysis['structure']['images'] += 1
             
             # Calculate statistics
+            full_text = ''.join(text_parts)
             analysis['statistics']['total_characters'] = len(full_text)
-            words = full_text.split()
-            analysis['statistics']['total_words'] = len(words)
+            
+            words = len(full_text.split())
+            analysis['statistics']['total_words'] = words
             
             # Estimate sentences (simple approach)
-            sentences = [s for s in full_text.split('.') if s.strip()]
-            analysis['statistics']['total_sentences'] = len(sentences)
+            sentences = sum(1 for s in full_text.split('.') if s.strip())
+            analysis['statistics']['total_sentences'] = sentences
             
             # Readability metrics
             if sentences:
                 analysis['readability']['average_words_per_sentence'] = \
-                    round(len(words) / len(sentences), 1)
+                    round(words / sentences, 1)
             
             if analysis['statistics']['total_paragraphs'] > 0:
                 analysis['readability']['average_words_per_paragraph'] = \
-                    round(len(words) / analysis['statistics']['total_paragraphs'], 1)
+                    round(words / analysis['statistics']['total_paragraphs'], 1)
             
             # Convert sets to lists for JSON serialization
             analysis['formatting']['styles_used'] = list(analysis['formatting']['styles_used'])
@@ -292,7 +364,7 @@ class GoogleDocsCompleteSuite(GoogleDocsSpecializedTools):
             return analysis
             
         except Exception as e:
-            print(f"✗ Error analyzing document: {e}")
+            logger.error("✗ Error analyzing document: %s", e)
             return {}
     
     # ========================================================================
@@ -300,72 +372,68 @@ class GoogleDocsCompleteSuite(GoogleDocsSpecializedTools):
     # ========================================================================
     
     def batch_format_headings(self, doc_id: str, heading_styles: Dict[str, TextStyle],
-                            show_progress: bool = True) -> int:
-        """Format all headings with specified styles"""
-        structure = self.get_structure()
-        requests = []
+                            show_progress: bool = True,
+                            extra_requests: Optional[List[Dict]] = None) -> int:
+        """Format all headings with specified styles
+        
+        extra_requests, if given, are sent ahead of the heading updates in
+        the same batchUpdate.
+        """
+        structure = self.get_structure(doc_id)
+        requests = list(extra_requests or [])
         count = 0
         
         for item in structure:
-            if 'HEADING' in item['type']:
-                level = f"h{item['type'].split('_')[-1]}"
-                if level in heading_styles:
-                    style = heading_styles[level]
-                    
-                    # Build text style request
-                    text_style = {}
-                    fields = []
-                    
-                    if style.bold is not None:
-                        text_style['bold'] = style.bold
-                        fields.append('bold')
-                    if style.italic is not None:
-                        text_style['italic'] = style.italic
-                        fields.append('italic')
-                    if style.font_size:
-                        text_style['fontSize'] = {
-                            'magnitude': style.font_size,
-                            'unit': 'PT'
-                        }
-                        fields.append('fontSize')
-                    if style.foreground_color:
-                        text_style['foregroundColor'] = {
-                            'color': {
-                                'rgbColor': {
-                                    'red': style.foreground_color[0],
-                                    'green': style.foreground_color[1],
-                                    'blue': style.foreground_color[2]
-                                }
-                            }
+            level = HEADING_KEYS.get(item['type'])
+            if level in heading_styles:
+                style = heading_styles[level]
+                
+                # Build text style request
+                text_style = {}
+                fields = []
+                
+                if style.bold is not None:
+                    text_style['bold'] = style.bold
+                    fields.append('bold')
+                if style.italic is not None:
+                    text_style['italic'] = style.italic
+                    fields.append('italic')
+                if style.font_size:
+                    text_style['fontSize'] = {
+                        'magnitude': style.font_size,
+                        'unit': 'PT'
+                    }
+                    fields.append('fontSize')
+                if style.foreground_color is not None:
+                    text_style['foregroundColor'] = rgb_color(style.foreground_color)
+                    fields.append('foregroundColor')
+                
+                if fields:
+                    requests.append({
+                        'updateTextStyle': {
+                            'range': {
+                                'startIndex': item['start_index'],
+                                'endIndex': item['end_index'] - 1  # Exclude newline
+                            },
+                            'textStyle': text_style,
+                            'fields': ','.join(fields)
                         }
-                        fields.append('foregroundColor')
+                    })
+                    count += 1
                     
-                    if fields:
-                        requests.append({
-                            'updateTextStyle': {
-                                'range': {
-                                    'startIndex': item['start_index'],
-                                    'endIndex': item['end_index'] - 1  # Exclude newline
-                                },
-                                'textStyle': text_style,
-                                'fields': ','.join(fields)
-                            }
-                        })
-                        count += 1
-                        
-                        if show_progress and count % 10 == 0:
-                            print(f"  Processing heading {count}...")
+                    if show_progress and count % 10 == 0:
+                        logger.debug("  Processing heading %s...", count)
         
         if requests:
             # Execute in batches to prevent timeout
-            batch_size = 50
+            batch_size = 100
             for i in range(0, len(requests), batch_size):
                 batch = requests[i:i+batch_size]
                 self._execute_batch_update(doc_id, batch)
                 if show_progress:
-                    print(f"  Completed batch {i//batch_size + 1}/{(len(requests)-1)//batch_size + 1}")
+                    logger.debug("  Completed batch %s/%s", i//batch_size + 1, (len(requests)-1)//batch_size + 1)
         
-        print(f"✓ Formatted {count} headings")
+        logger.info("✓ Formatted %s headings", count)
         return count
     
     # ========================================================================
@@ -396,10 +464,11 @@ class GoogleDocsCompleteSuite(GoogleDocsSpecializedTools):
             'h3': TextStyle(bold=True, font_size=14, foreground_color=(0.4, 0.4, 0.4))
         }
         
-        # Format headings
-        self.batch_format_headings(doc_id, heading_styles, show_progress=False)
+        # Format headings, sending the margins in the same batchUpdate
+        self.batch_format_headings(doc_id, heading_styles, show_progress=False,
+                                   extra_requests=requests)
         
-        print("✓ Applied professional template")
+        logger.info("✓ Applied professional template")
         return True
     
     # ========================================================================
@@ -482,7 +551,7 @@ class GoogleDocsCompleteSuite(GoogleDocsSpecializedTools):
         }
         
         if format_type not in presets:
-            print(f"✗ Unknown format type: {format_type}")
+            logger.error("✗ Unknown format type: %s", format_type)
             return False
         
         preset = presets[format_type]
@@ -496,7 +565,7 @@ class GoogleDocsCompleteSuite(GoogleDocsSpecializedTools):
             margin_right=preset['margins']['right']
         )
         
-        print(f"✓ Applied {format_type} formatting")
+        logger.info("✓ Applied %s formatting", format_type)
         return True
 
 
@@ -551,4 +620,5 @@ def main():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get('BMPOA_LOGLEVEL', 'INFO'), format='%(message)s')
     suite = main()
\ No newline at end of file
@@ -4,12 +4,13 @@ Google Docs Specialized Tools
 Advanced tools for specific document manipulation tasks
 """
 
+import os
 import re
 import json
+import logging
 from typing import List, Dict, Optional, Tuple, Any
 from google_docs_advanced_toolkit import (
-    GoogleDocsAdvancedToolkit, TextStyle, ParagraphStyle, 
-    ParagraphAlignment, NamedStyleType, ListGlyphType
+    GoogleDocsAdvancedToolkit, TextStyle, ParagraphStyle, STYLE_NORMAL_TEXT, logger
 )
 
 
@@ -32,7 +33,7 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
         }
         
         # Get document content
-        document = self.docs_service.documents().get(documentId=doc_id).execute()
+        document = self._get_document(doc_id)
         content = document.get('body', {}).get('content', [])
         
         # Find all placeholders matching pattern {{variable}}
@@ -63,7 +64,7 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
                         
                         template_info['variables'][var] = None
         
-        print(f"✓ Created template with {len(variables)} variables")
+        logger.info("✓ Created template with %s variables", len(variables))
         return template_info
     
     def mail_merge(self, template_doc_id: str, data: List[Dict[str, str]], 
@@ -103,7 +104,7 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
                 # If updating single document, break after first record
                 break
         
-        print(f"✓ Mail merge complete: {len(created_docs)} documents processed")
+        logger.info("✓ Mail merge complete: %s documents processed", len(created_docs))
         return created_docs
     
     # ========================================================================
@@ -134,7 +135,7 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
             
             if count > 0 and text_style:
                 # Now find all occurrences of the replaced text and format them
-                document = self.docs_service.documents().get(documentId=doc_id).execute()
+                document = self._get_document(doc_id)
                 format_requests = []
                 
                 # Search through content
@@ -186,18 +187,18 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
                 if format_requests:
                     self._execute_batch_update(doc_id, format_requests)
             
-            print(f"✓ Replaced and formatted {count} occurrences")
+            logger.info("✓ Replaced and formatted %s occurrences", count)
             return count
             
         except Exception as e:
-            print(f"✗ Error in find and replace: {e}")
+            logger.error("✗ Error in find and replace: %s", e)
             return 0
     
     def regex_replace(self, doc_id: str, pattern: str, replacement: str,
                      case_sensitive: bool = True) -> int:
         """Replace text using regular expressions"""
         # Get document content
-        document = self.docs_service.documents().get(documentId=doc_id).execute()
+        document = self._get_document(doc_id)
         content_elements = document.get('body', {}).get('content', [])
         
         # Build full text and track positions
@@ -224,7 +225,7 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
         matches = list(re.finditer(pattern, full_text, flags))
         
         if not matches:
-            print("No matches found")
+            logger.info("No matches found")
             return 0
         
         # Build replacement requests (process in reverse to maintain indices)
@@ -266,7 +267,7 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
         
         if requests:
             self._execute_batch_update(doc_id, requests)
-            print(f"✓ Replaced {len(matches)} matches using regex")
+            logger.info("✓ Replaced %s matches using regex", len(matches))
             return len(matches)
         
         return 0
@@ -275,11 +276,38 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
     # TABLE OF CONTENTS AND INDEXING
     # ========================================================================
     
+    def get_structure(self, doc_id: str) -> List[Dict[str, Any]]:
+        """Get document structure (non-empty headings with their ranges)"""
+        document = self._get_document(doc_id)
+        structure = []
+        
+        for element in document.get('body', {}).get('content', []):
+            if 'paragraph' in element:
+                paragraph = element['paragraph']
+                style = paragraph.get('paragraphStyle', {}).get('namedStyleType', '')
+                
+                if 'HEADING' in style:
+                    text = ''.join(
+                        elem['textRun'].get('content', '')
+                        for elem in paragraph.get('elements', [])
+                        if 'textRun' in elem
+                    )
+                    
+                    if text.strip():
+                        structure.append({
+                            'type': style,
+                            'text': text.strip(),
+                            'start_index': element.get('startIndex', 0),
+                            'end_index': element.get('endIndex', 0)
+                        })
+        
+        return structure
+    
     def generate_table_of_contents(self, doc_id: str, max_level: int = 3,
                                   insert_at_index: int = 1) -> bool:
         """Generate a table of contents based on headings"""
         # Get document structure
-        structure = self.get_structure()
+        structure = self.get_structure(doc_id)
         
         # Filter headings up to max level
         toc_entries = []
@@ -294,7 +322,7 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
                     })
         
         if not toc_entries:
-            print("No headings found for table of contents")
+            logger.info("No headings found for table of contents")
             return False
         
         # Build TOC text
@@ -335,14 +363,14 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
         ]
         
         self._execute_batch_update(doc_id, requests)
-        print(f"✓ Generated table of contents with {len(toc_entries)} entries")
+        logger.info("✓ Generated table of contents with %s entries", len(toc_entries))
         return True
     
     def create_index(self, doc_id: str, terms: List[str],
                     insert_at_end: bool = True) -> bool:
         """Create an index of specified terms"""
         # Get document
-        document = self.docs_service.documents().get(documentId=doc_id).execute()
+        document = self._get_document(doc_id)
         
         # Find all occurrences of terms
         index_entries = {}
@@ -370,7 +398,7 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
                 index_entries[term] = occurrences
         
         if not index_entries:
-            print("No index entries found")
+            logger.info("No index entries found")
             return False
         
         # Build index text
@@ -410,7 +438,7 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
         ]
         
         self._execute_batch_update(doc_id, requests)
-        print(f"✓ Created index with {len(index_entries)} terms")
+        logger.info("✓ Created index with %s terms", len(index_entries))
         return True
     
     # ========================================================================
@@ -422,8 +450,8 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
         """Add a comment to a text range"""
         # Note: Comments API requires different scope and method
         # This is a placeholder showing the structure
-        print(f"Comment feature requires additional Drive API scope")
-        print(f"Would add comment: '{comment_text}' at range {start_index}-{end_index}")
+        logger.warning("Comment feature requires additional Drive API scope")
+        logger.warning("Would add comment: '%s' at range %s-%s", comment_text, start_index, end_index)
         return True
     
     def create_suggestion(self, doc_id: str, start_index: int, end_index: int,
@@ -445,8 +473,8 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
         }]
         
         # Note: Real suggestions require special mode
-        print(f"Suggestion feature requires document in suggestion mode")
-        print(f"Would suggest replacing range {start_index}-{end_index} with: '{suggested_text}'")
+        logger.warning("Suggestion feature requires document in suggestion mode")
+        logger.warning("Would suggest replacing range %s-%s with: '%s'", start_index, end_index, suggested_text)
         return True
     
     # ========================================================================
@@ -456,8 +484,8 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
     def compare_documents(self, doc_id1: str, doc_id2: str) -> Dict[str, Any]:
         """Compare two documents and find differences"""
         # Get both documents
-        doc1 = self.docs_service.documents().get(documentId=doc_id1).execute()
-        doc2 = self.docs_service.documents().get(documentId=doc_id2).execute()
+        doc1 = self._get_document(doc_id1)
+        doc2 = self._get_document(doc_id2)
         
         # Extract text content
         def extract_text(doc):
@@ -506,18 +534,18 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
                     'modified': text2[i][:100] + '...' if len(text2[i]) > 100 else text2[i]
                 })
         
-        print(f"✓ Document comparison complete")
+        logger.info("✓ Document comparison complete")
         return comparison
     
     def track_changes(self, doc_id: str, baseline_file: str = None) -> Dict[str, Any]:
         """Track changes in a document since last baseline"""
-        current_doc = self.docs_service.documents().get(documentId=doc_id).execute()
+        current_doc = self._get_document(doc_id)
         
         # Save current state as baseline if requested
         if baseline_file:
             with open(baseline_file, 'w') as f:
                 json.dump(current_doc, f, indent=2)
-            print(f"✓ Saved baseline to {baseline_file}")
+            logger.info("✓ Saved baseline to %s", baseline_file)
             return {'status': 'baseline_saved'}
         
         # Load previous baseline if exists
@@ -529,7 +557,7 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
             # No baseline, save current as baseline
             with open(baseline_path, 'w') as f:
                 json.dump(current_doc, f, indent=2)
-            print(f"✓ Created initial baseline")
+            logger.info("✓ Created initial baseline")
             return {'status': 'initial_baseline_created'}
         
         # Compare revision IDs
@@ -541,9 +569,9 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
         }
         
         if changes['changed']:
-            print(f"✓ Document has changed since baseline")
+            logger.info("✓ Document has changed since baseline")
         else:
-            print(f"✓ No changes since baseline")
+            logger.info("✓ No changes since baseline")
         
         return changes
     
@@ -553,13 +581,13 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
     
     def execute_script(self, doc_id: str, script: List[Dict[str, Any]]) -> bool:
         """Execute a series of operations defined in a script"""
-        print(f"Executing script with {len(script)} operations...")
+        logger.debug("Executing script with %s operations...", len(script))
         
         for i, operation in enumerate(script):
             op_type = operation.get('type')
             params = operation.get('params', {})
             
-            print(f"\nOperation {i+1}: {op_type}")
+            logger.debug("Operation %s: %s", i+1, op_type)
             
             try:
                 if op_type == 'insert_text':
@@ -588,19 +616,19 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
                         doc_id,
                         params.get('start', 1),
                         params.get('end', 2),
-                        NamedStyleType[params.get('style', 'NORMAL_TEXT')]
+                        params.get('style', STYLE_NORMAL_TEXT)
                     )
                 elif op_type == 'insert_page_break':
                     self.insert_page_break(doc_id, params.get('index', 1))
                 else:
-                    print(f"Unknown operation type: {op_type}")
+                    logger.error("Unknown operation type: %s", op_type)
                     
             except Exception as e:
-                print(f"Error in operation {i+1}: {e}")
+                logger.error("Error in operation %s: %s", i+1, e)
                 if not operation.get('continue_on_error', True):
                     return False
         
-        print(f"\n✓ Script execution complete")
+        logger.info("✓ Script execution complete")
         return True
     
     def batch_process_documents(self, doc_ids: List[str], 
@@ -609,7 +637,7 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
         results = {}
         
         for doc_id in doc_ids:
-            print(f"\nProcessing document: {doc_id}")
+            logger.debug("Processing document: %s", doc_id)
             try:
                 if operation == 'replace_all':
                     success = self._execute_batch_update(doc_id, [{
@@ -630,18 +658,18 @@ class GoogleDocsSpecializedTools(GoogleDocsAdvancedToolkit):
                     output_file = params.get('output_pattern', '{doc_id}.pdf').format(doc_id=doc_id)
                     success = self.export_as_pdf(doc_id, output_file)
                 else:
-                    print(f"Unknown operation: {operation}")
+                    logger.error("Unknown operation: %s", operation)
                     success = False
                 
                 results[doc_id] = success
                 
             except Exception as e:
-                print(f"Error processing {doc_id}: {e}")
+                logger.error("Error processing %s: %s", doc_id, e)
                 results[doc_id] = False
         
         # Summary
         successful = sum(1 for v in results.values() if v)
-        print(f"\n✓ Batch processing complete: {successful}/{len(doc_ids)} successful")
+        logger.info("✓ Batch processing complete: %s/%s successful", successful, len(doc_ids))
         
         return results
 
@@ -728,4 +756,5 @@ def demonstrate_specialized_features():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=os.environ.get('BMPOA_LOGLEVEL', 'INFO'), format='%(message)s')
     toolkit = demonstrate_specialized_features()
\ No newline at end of file
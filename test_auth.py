@@ -34,7 +34,7 @@ def test_auth():
     doc_id = "169fOjfUuf2j-V0HIVCS8REf3Wtl94D5Gxt67sUdgJQs"
     
     try:
-        document = service.documents().get(documentId=doc_id).execute()
+        document = service.documents().get(documentId=doc_id, fields='title').execute()
         print(f"✓ Success! Connected to: {document.get('title')}")
         return True
     except Exception as e: